@@ -0,0 +1,8 @@
+from pcweb import constants
+from pcweb.profiler import profiler
+
+# Start profiling before the rest of the package is imported. The pc CLI and
+# run.py have already imported pynecone by now, so its own import time is not
+# in the report.
+if constants.PROFILE_STARTUP:
+    profiler.start()
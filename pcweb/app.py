@@ -0,0 +1,208 @@
+"""The app, with middleware dispatched by event."""
+
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import pynecone as pc
+from pynecone.compiler import compiler
+from pynecone.compiler import utils as compiler_utils
+from pynecone.event import Event
+from pynecone.route import DECORATED_ROUTES
+
+from pcweb.components.preload import preload
+from pcweb.incremental import compile_incremental
+from pcweb.middleware import Middleware
+
+
+def compiles() -> bool:
+    """Whether this process compiles the app.
+
+    The app is compiled in dev mode, and by `pc export` and `pc run` in prod
+    mode, which export it before starting the backend. The prod backend runs
+    in gunicorn workers, which import the app only to serve its events.
+
+    Returns:
+        Whether the pages built in this process are compiled.
+    """
+    command = os.path.basename(sys.argv[0])
+    if command == pc.constants.RUN_BACKEND_PROD[0]:
+        return False
+    if pc.utils.get_config().env == pc.constants.Env.DEV:
+        return True
+    return command == "run.py" or "export" in sys.argv or "run" in sys.argv
+
+
+class App(pc.App):
+    """An app that only runs middleware for the events it subscribes to.
+
+    Middleware can declare the names of the events they handle in an
+    `events` set, and are skipped for every other event. The middleware to
+    run for each event name are worked out once. The time spent in each
+    middleware is counted and served at `/metrics/middleware`.
+
+    The document root also preloads the fonts in `preloads`.
+    """
+
+    # Whether to only compile the pages whose inputs changed.
+    incremental: bool = False
+
+    # The module defining each page, by formatted route, for incremental compiles.
+    page_modules: Dict[str, str] = {}
+
+    # The URLs of the fonts for browsers to fetch before they are needed.
+    preloads: List[str] = []
+
+    # The middleware to run for each event name.
+    middleware_dispatch: Dict[str, List[pc.Middleware]] = {}
+
+    # The number of calls and the total seconds spent in each middleware.
+    middleware_timings: Dict[str, Dict[str, float]] = {}
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the app.
+
+        Args:
+            *args: Args to initialize the app with.
+            **kwargs: Kwargs to initialize the app with.
+        """
+        super().__init__(*args, **kwargs)
+        self.api.get("/metrics/middleware")(self.middleware_metrics)
+
+    async def middleware_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Get the time spent in each middleware.
+
+        Returns:
+            The calls and total seconds of each middleware.
+        """
+        return self.middleware_timings
+
+    def compile(self, force_compile: bool = False):
+        """Compile the app, with the fonts preloaded in the document root.
+
+        Incremental apps only compile the pages whose inputs changed since
+        the last compile, and keep the others.
+
+        Args:
+            force_compile: Whether to compile the app in non-dev mode.
+        """
+        if not self.incremental:
+            super().compile(force_compile=force_compile)
+            config = pc.utils.get_config()
+            if config.env == pc.constants.Env.DEV or force_compile:
+                self.compile_document_root()
+            return
+
+        for render, kwargs in DECORATED_ROUTES:
+            self.add_page(render, **kwargs)
+        if pc.utils.get_config().env != pc.constants.Env.DEV and not force_compile:
+            pc.utils.console.print("Skipping compilation in non-dev mode.")
+            return
+        compile_incremental(self, self.page_modules)
+
+    def compile_document_root(self):
+        """Compile the document root, with the stylesheets and preloads."""
+        document_root = compiler_utils.create_document_root(self.stylesheets)
+        head = document_root.children[0]
+        head.children = [
+            preload(
+                rel="preload",
+                href=href,
+                as_="font",
+                type_="font/woff2",
+                cross_origin="anonymous",
+            )
+            for href in self.preloads
+        ] + head.children
+        compiler_utils.write_page(
+            compiler_utils.get_page_path(pc.constants.DOCUMENT_ROOT),
+            compiler._compile_document_root(document_root),
+        )
+
+    def add_middleware(self, middleware: pc.Middleware, index: Optional[int] = None):
+        """Add middleware to the app.
+
+        Args:
+            middleware: The middleware to add.
+            index: The index to add the middleware at.
+        """
+        super().add_middleware(middleware, index=index)
+        if isinstance(middleware, Middleware):
+            middleware.setup(self)
+        self.middleware_dispatch.clear()
+
+    def get_middleware(self, event: Event) -> List[pc.Middleware]:
+        """Get the middleware to run for an event, in order.
+
+        Args:
+            event: The event.
+
+        Returns:
+            The middleware subscribed to the event.
+        """
+        if event.name not in self.middleware_dispatch:
+            state_name = self.state.get_name()
+            self.middleware_dispatch[event.name] = [
+                middleware
+                for middleware in self.middleware
+                if getattr(middleware, "events", None) is None
+                or event.name in {f"{state_name}.{name}" for name in middleware.events}
+            ]
+        return self.middleware_dispatch[event.name]
+
+    def _timed(self, middleware: pc.Middleware, stage: str, fn, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(app=self, **kwargs)
+        finally:
+            name = f"{type(middleware).__name__}.{stage}"
+            timing = self.middleware_timings.setdefault(
+                name, {"calls": 0, "seconds": 0.0}
+            )
+            timing["calls"] += 1
+            timing["seconds"] += time.perf_counter() - start
+
+    def preprocess(self, state: pc.State, event: Event):
+        """Preprocess the event with the middleware subscribed to it.
+
+        Args:
+            state: The state to preprocess.
+            event: The event to preprocess.
+
+        Returns:
+            An optional delta or list of state updates to return.
+        """
+        for middleware in self.get_middleware(event):
+            out = self._timed(
+                middleware,
+                "preprocess",
+                middleware.preprocess,
+                state=state,
+                event=event,
+            )
+            if out is not None:
+                return out
+
+    def postprocess(self, state: pc.State, event: Event, delta):
+        """Postprocess the event with the middleware subscribed to it.
+
+        Args:
+            state: The state to postprocess.
+            event: The event to postprocess.
+            delta: The delta to postprocess.
+
+        Returns:
+            An optional state to return.
+        """
+        for middleware in self.get_middleware(event):
+            out = self._timed(
+                middleware,
+                "postprocess",
+                middleware.postprocess,
+                state=state,
+                event=event,
+                delta=delta,
+            )
+            if out is not None:
+                return out
@@ -1,7 +1,182 @@
 """The base application state."""
 
+import ast
+import inspect
+import textwrap
+from typing import Callable, ClassVar, Dict, Optional, Set
+
 import pynecone as pc
+from pynecone import utils
+
+
+def depends_on(*names: str) -> Callable:
+    """Declare the vars a computed var depends on.
+
+    Use it under `pc.var` for computed vars whose dependencies can't be
+    inferred from their source.
+
+    Args:
+        names: The names of the vars the computed var reads.
+
+    Returns:
+        A decorator recording the dependencies on the getter.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        fn.__pcweb_deps__ = set(names)
+        return fn
+
+    return decorator
+
+
+def infer_dependencies(fn: Callable) -> Optional[Set[str]]:
+    """Infer the attributes of `self` that a computed var reads.
+
+    The inference only holds if `self` is used for nothing but reading
+    attributes by name. A getter that passes `self` on, aliases it, or reads
+    it through `getattr`, or that reads no attribute of `self` at all, and so
+    only depends on something else, can't be tracked.
+
+    Args:
+        fn: The getter of the computed var.
+
+    Returns:
+        The names of the attributes, or None if they can't be inferred.
+    """
+    try:
+        source = textwrap.dedent(inspect.getsource(fn))
+    except (OSError, TypeError):
+        return None
+
+    # Find the node using each reference to `self`.
+    parents = {}
+    for node in ast.walk(ast.parse(source)):
+        for child in ast.iter_child_nodes(node):
+            parents[child] = node
+
+    names = set()
+    for node, parent in parents.items():
+        if not (isinstance(node, ast.Name) and node.id == "self"):
+            continue
+        if not (
+            isinstance(parent, ast.Attribute)
+            and parent.value is node
+            and isinstance(parent.ctx, ast.Load)
+        ):
+            return None
+        names.add(parent.attr)
+    return names or None
+
+
+class DependencyTracking:
+    """Only recompute computed vars when a var they depend on changed.
+
+    Without this, every computed var of a state is recomputed on every update
+    to the state. The dependencies are declared with `depends_on`, or inferred
+    from the getter. A computed var that reads anything other than vars of its
+    state is always recomputed.
+
+    This is a mixin rather than part of the state class, since pynecone turns
+    the methods defined on a state into event handlers.
+    """
+
+    # The base vars each computed var depends on, or None to always recompute.
+    computed_var_deps: ClassVar[Dict[str, Optional[Set[str]]]] = {}
+
+    @classmethod
+    def get_computed_var_deps(cls) -> Dict[str, Optional[Set[str]]]:
+        """Get the base vars that each computed var of the state depends on.
+
+        Returns:
+            The dependencies of each computed var.
+        """
+        if "computed_var_deps" in cls.__dict__:
+            return cls.computed_var_deps
+
+        # Get the direct dependencies of each computed var.
+        direct = {}
+        for name, var in cls.computed_vars.items():
+            deps = getattr(var.fget, "__pcweb_deps__", None)
+            direct[name] = deps if deps is not None else infer_dependencies(var.fget)
+
+        # Resolve computed vars that depend on other computed vars.
+        def resolve(name: str, seen: Set[str]) -> Optional[Set[str]]:
+            deps = direct[name]
+            if deps is None or name in seen:
+                return deps
+            resolved = set()
+            for dep in deps:
+                if dep in direct:
+                    sub = resolve(dep, seen | {name})
+                    if sub is None:
+                        return None
+                    resolved |= sub
+                elif dep in cls.base_vars or dep in cls.inherited_vars:
+                    resolved.add(dep)
+                else:
+                    return None
+            return resolved
+
+        cls.computed_var_deps = {name: resolve(name, set()) for name in direct}
+        return cls.computed_var_deps
+
+    def get_changed_vars(self) -> Set[str]:
+        """Get the vars of the state that changed since the last delta.
+
+        Inherited vars change in the parent state, so the dirty vars of the
+        parents, and the computed vars they affect, are included.
+
+        Returns:
+            The names of the changed vars.
+        """
+        changed = set(self.dirty_vars)
+        if self.parent_state is not None:
+            parent_changed = self.parent_state.get_changed_vars()
+            changed |= parent_changed | self.parent_state.get_affected_vars(
+                parent_changed
+            )
+        return changed
+
+    def get_affected_vars(self, changed: Set[str]) -> Set[str]:
+        """Get the computed vars of the state to recompute.
+
+        Args:
+            changed: The names of the vars that changed.
+
+        Returns:
+            The names of the computed vars depending on the changed vars.
+        """
+        return {
+            name
+            for name, deps in self.get_computed_var_deps().items()
+            if deps is None or deps & changed
+        }
+
+    def get_delta(self):
+        """Get the delta for the state.
+
+        This matches `pc.State.get_delta`, except that computed vars are only
+        included when their dependencies are dirty.
+
+        Returns:
+            The delta for the state.
+        """
+        delta = {}
+
+        # Return the dirty vars, as well as the computed vars they affect.
+        computed = self.get_affected_vars(self.get_changed_vars())
+        subdelta = {prop: getattr(self, prop) for prop in self.dirty_vars | computed}
+        if len(subdelta) > 0:
+            delta[self.get_full_name()] = subdelta
+
+        # Recursively find the substate deltas.
+        substates = self.substates
+        for substate in self.dirty_substates:
+            delta.update(substates[substate].get_delta())
+
+        # Format the delta.
+        return utils.format_state(delta)
 
 
-class State(pc.State):
+class State(DependencyTracking, pc.State):
     """The base state."""
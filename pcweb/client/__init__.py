@@ -0,0 +1,72 @@
+"""Components implemented in JavaScript that run entirely in the browser.
+
+Each `.js` module in this package is copied into the frontend when the app is
+compiled, and is imported from `/utils/pcweb/<module>`. The frontend config
+the components rely on is written along with them.
+"""
+
+import json
+import os
+import shutil
+
+import pynecone as pc
+
+from pcweb import constants
+
+# Where the client modules are copied to in the frontend.
+CLIENT_DIR = os.path.join(pc.constants.WEB_UTILS_DIR, "pcweb")
+
+# The Next.js config, with the headers of the assets named by their hash.
+NEXT_CONFIG = """module.exports = {
+  reactStrictMode: true,
+  async headers() {
+    return [
+      {
+        source: %s,
+        headers: [{key: "Cache-Control", value: %s}],
+      },
+    ]
+  },
+}
+"""
+
+
+def library(module: str) -> str:
+    """Get the import path of a client module.
+
+    Args:
+        module: The name of the module, without the extension.
+
+    Returns:
+        The path to import the module from in the frontend.
+    """
+    return f"/{pc.constants.UTILS_DIR}/pcweb/{module}"
+
+
+def write_modules():
+    """Copy the client modules into the frontend."""
+    os.makedirs(CLIENT_DIR, exist_ok=True)
+    for filename in os.listdir(os.path.dirname(__file__)):
+        if filename.endswith(".js"):
+            shutil.copyfile(
+                os.path.join(os.path.dirname(__file__), filename),
+                os.path.join(CLIENT_DIR, filename),
+            )
+
+
+def write_config():
+    """Write the Next.js config, so the hashed assets are cached for good.
+
+    The assets are served by the frontend, not the backend, so their headers
+    are set in its config. The template config is only copied into the
+    frontend if there is none, so this one is kept.
+    """
+    prefix = os.path.relpath(constants.OPTIMIZED_ASSETS_DIR, constants.ASSETS_DIR)
+    with open(os.path.join(pc.constants.WEB_DIR, "next.config.js"), "w") as f:
+        f.write(
+            NEXT_CONFIG
+            % (
+                json.dumps(f"/{prefix}/:path*"),
+                json.dumps(constants.HASHED_ASSET_CACHE_CONTROL),
+            )
+        )
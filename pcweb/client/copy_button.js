@@ -0,0 +1,39 @@
+import {useEffect, useState} from "react"
+import {Tooltip} from "@chakra-ui/react"
+import {CheckCircleIcon, CopyIcon} from "@chakra-ui/icons"
+import {CopyToClipboard} from "react-copy-to-clipboard"
+
+// A copy icon that shows a "Copied!" tooltip for a while after copying.
+// The feedback is kept in browser state, so copying never reaches the backend.
+export const CopyButton = ({text, timeout = 2000, iconStyle, accentColor}) => {
+  const [copied, setCopied] = useState(false)
+
+  // Reset the feedback once the timeout passes.
+  useEffect(() => {
+    if (!copied) {
+      return
+    }
+    const timer = setTimeout(() => setCopied(false), timeout)
+    return () => clearTimeout(timer)
+  }, [copied, timeout])
+
+  if (copied) {
+    return (
+      <Tooltip
+        label="Copied!"
+        closeOnClick={false}
+        padding="0.5em"
+        borderRadius="0.5em"
+        backgroundColor={accentColor}
+        isOpen
+      >
+        <CheckCircleIcon sx={{...iconStyle, color: accentColor}} />
+      </Tooltip>
+    )
+  }
+  return (
+    <CopyToClipboard text={text} onCopy={() => setCopied(true)}>
+      <CopyIcon sx={iconStyle} />
+    </CopyToClipboard>
+  )
+}
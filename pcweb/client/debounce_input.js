@@ -0,0 +1,25 @@
+import {useEffect, useRef, useState} from "react"
+import {Input} from "@chakra-ui/react"
+
+// An input that only reports its value once typing pauses, so a backend
+// handler runs once per pause instead of once per keystroke.
+export const DebounceInput = ({value = "", onChange, debounceTimeout = 300, ...props}) => {
+  const [text, setText] = useState(value)
+  const timer = useRef(null)
+
+  // Clear a pending change when the input unmounts.
+  useEffect(() => () => clearTimeout(timer.current), [])
+
+  const handleChange = (e) => {
+    const next = e.target.value
+    setText(next)
+    clearTimeout(timer.current)
+    timer.current = setTimeout(() => {
+      if (onChange) {
+        onChange({target: {value: next}})
+      }
+    }, debounceTimeout)
+  }
+
+  return <Input {...props} value={text} onChange={handleChange} />
+}
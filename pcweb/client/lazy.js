@@ -0,0 +1,71 @@
+import {useEffect, useRef, useState} from "react"
+import {Box, Stack} from "@chakra-ui/react"
+
+// Media that only loads once it is near the viewport, showing a tiny
+// placeholder until then, so it doesn't compete with the content above it.
+
+// Track whether an element has come near the viewport.
+const useNearViewport = (rootMargin) => {
+  const ref = useRef(null)
+  const [near, setNear] = useState(false)
+
+  useEffect(() => {
+    if (near || !ref.current) {
+      return
+    }
+    if (!("IntersectionObserver" in window)) {
+      setNear(true)
+      return
+    }
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+          setNear(true)
+          observer.disconnect()
+        }
+      },
+      {rootMargin}
+    )
+    observer.observe(ref.current)
+    return () => observer.disconnect()
+  }, [near, rootMargin])
+
+  return [ref, near]
+}
+
+// A stack whose background image loads once it is near the viewport.
+export const LazyBackground = ({
+  src,
+  placeholder,
+  placeholderSize,
+  rootMargin = "200px",
+  ...props
+}) => {
+  const [ref, near] = useNearViewport(rootMargin)
+  return (
+    <Stack
+      ref={ref}
+      {...props}
+      backgroundImage={near ? src : placeholder}
+      backgroundSize={near ? undefined : placeholderSize}
+    />
+  )
+}
+
+// A video whose poster and sources load once it is near the viewport.
+export const LazyVideo = ({poster, placeholder, rootMargin = "200px", children, ...props}) => {
+  const [ref, near] = useNearViewport(rootMargin)
+
+  // Load the sources once they are added.
+  useEffect(() => {
+    if (near && ref.current) {
+      ref.current.load()
+    }
+  }, [near])
+
+  return (
+    <Box ref={ref} as="video" {...props} poster={near ? poster : placeholder}>
+      {near && children}
+    </Box>
+  )
+}
@@ -0,0 +1,178 @@
+import {useEffect, useMemo, useState} from "react"
+import NextLink from "next/link"
+import {Divider, Input, Link, Text, VStack} from "@chakra-ui/react"
+
+// Search the site in the browser, from the index written by the build, so
+// searching never reaches the backend. This mirrors pcweb/search.py.
+
+// The weight of a match in the heading and the description.
+const FIELD_WEIGHTS = [2, 1]
+
+// The BM25 parameters.
+const K1 = 1.2
+const B = 0.75
+
+// Lowercase text and strip its diacritics, so "hoc" matches "Học".
+const fold = (text) =>
+  text.toLowerCase().replace(/đ/g, "d").normalize("NFD").replace(/\p{M}/gu, "")
+
+const tokenize = (text) => fold(text).match(/[\p{L}\p{N}_]+/gu) || []
+
+// The engine for each index URL, loaded once per page load.
+const engines = {}
+
+const loadEngine = (url) => {
+  if (!engines[url]) {
+    engines[url] = fetch(url)
+      .then((response) =>
+        new Response(response.body.pipeThrough(new DecompressionStream("gzip"))).json()
+      )
+      .then(createEngine)
+  }
+  return engines[url]
+}
+
+const createEngine = ({documents, lengths, postings}) => {
+  const count = Math.max(lengths.length, 1)
+  const terms = Object.keys(postings).sort()
+  const averageLengths = FIELD_WEIGHTS.map((_, i) =>
+    Math.max(lengths.reduce((total, length) => total + length[i], 0) / count, 1)
+  )
+  const idf = (term) => {
+    const frequency = postings[term].length
+    return Math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+  }
+
+  // Get the terms starting with a prefix.
+  const expand = (prefix) => {
+    let low = 0
+    let high = terms.length
+    while (low < high) {
+      const middle = (low + high) >> 1
+      if (terms[middle] < prefix) {
+        low = middle + 1
+      } else {
+        high = middle
+      }
+    }
+    const matches = []
+    for (let i = low; i < terms.length && terms[i].startsWith(prefix); i++) {
+      matches.push(terms[i])
+    }
+    return matches
+  }
+
+  // Score the documents containing a term.
+  const score = (term) => {
+    const scores = new Map()
+    for (const [number, ...frequencies] of postings[term] || []) {
+      let total = 0
+      frequencies.forEach((frequency, i) => {
+        if (frequency === 0) {
+          return
+        }
+        const norm = 1 - B + (B * lengths[number][i]) / averageLengths[i]
+        total += (FIELD_WEIGHTS[i] * frequency * (K1 + 1)) / (frequency + K1 * norm)
+      })
+      scores.set(number, idf(term) * total)
+    }
+    return scores
+  }
+
+  // Find the documents matching every term of a query. The last term also
+  // matches as a prefix, since it is usually still being typed.
+  const search = (query, limit) => {
+    const queryTerms = tokenize(query)
+    if (queryTerms.length === 0) {
+      return []
+    }
+    let totals = null
+    queryTerms.forEach((term, i) => {
+      if (totals !== null && totals.size === 0) {
+        return
+      }
+      const scores = new Map()
+      const expanded = i === queryTerms.length - 1 ? expand(term) : [term]
+      for (const match of expanded) {
+        for (const [number, value] of score(match)) {
+          scores.set(number, (scores.get(number) || 0) + value)
+        }
+      }
+      if (totals === null) {
+        totals = scores
+      } else {
+        const next = new Map()
+        for (const [number, value] of totals) {
+          if (scores.has(number)) {
+            next.set(number, value + scores.get(number))
+          }
+        }
+        totals = next
+      }
+    })
+    return [...totals.entries()]
+      .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+      .slice(0, limit)
+      .map(([number]) => {
+        const [heading, description, href] = documents[number]
+        return {heading, description, href}
+      })
+  }
+
+  return {search}
+}
+
+export const LocalSearch = ({
+  indexUrl,
+  placeholder,
+  limit = 10,
+  headingColor,
+  textColor,
+  onSelect,
+}) => {
+  const [engine, setEngine] = useState(null)
+  const [query, setQuery] = useState("")
+
+  useEffect(() => {
+    loadEngine(indexUrl).then(setEngine)
+  }, [indexUrl])
+
+  const results = useMemo(
+    () => (engine ? engine.search(query, limit) : []),
+    [engine, query, limit]
+  )
+
+  return (
+    <VStack width="100%">
+      <Input
+        placeholder={placeholder}
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+        autoFocus
+      />
+      {results.map((document) => (
+        <VStack
+          key={`${document.href}-${document.heading}`}
+          bg="#f7f7f7"
+          borderRadius="0.5em"
+          width="100%"
+          alignItems="start"
+          padding="0.5em"
+          _hover={{backgroundColor: "#e3e3e3c"}}
+        >
+          <NextLink href={document.href} passHref>
+            <Link onClick={onSelect}>
+              <Text fontWeight={600} color={headingColor}>
+                {document.heading}
+              </Text>
+              <Divider />
+              <Text fontWeight={400} color={textColor}>
+                {document.description}
+              </Text>
+            </Link>
+          </NextLink>
+        </VStack>
+      ))}
+    </VStack>
+  )
+}
@@ -2,7 +2,7 @@ import pynecone as pc
 
 from pcweb import constants, styles
 from pcweb.components.logo import logo
-from pcweb.pages.index import index
+from pcweb.pages import index_route
 
 footer_item_style = {
     "font_family": "Inter",
@@ -21,7 +21,8 @@ footer_style = {
 }
 
 
-def footer(style=footer_style):
+@pc.component
+def footer_comp() -> pc.Component:
     return pc.box(
         pc.vstack(
             pc.hstack(
@@ -30,29 +31,33 @@ def footer(style=footer_style):
                         "Edmæte",
                         font_size=styles.H1_FONT_SIZE,
                         color="#000",
-                        font_weight=styles.BOLD_WEIGHT
+                        font_weight=styles.BOLD_WEIGHT,
                     ),
                     pc.text(
                         "Nền tảng rèn luyện tâm sinh lý hàng đầu Việt Nam.",
                         font_size="1em",
-                        color="#000"
+                        color="#000",
                     ),
-                    align_items="start"
+                    align_items="start",
                 ),
                 pc.vstack(
                     pc.text("Trang web", color=styles.SUBHEADING_COLOR),
-                    pc.link("Trang chủ", href=index.path, style=footer_item_style),
+                    pc.link(
+                        "Trang chủ", href=index_route.path, style=footer_item_style
+                    ),
                     pc.link("Thư viện học liệu", href="", style=footer_item_style),
                     pc.link("Về chúng tôi", href="", style=footer_item_style),
                     align_items="start",
                 ),
                 pc.vstack(
-                    pc.text("Đây là một dự án startup tại", color=styles.SUBHEADING_COLOR),
+                    pc.text(
+                        "Đây là một dự án startup tại", color=styles.SUBHEADING_COLOR
+                    ),
                     pc.text(
                         "Trường THPT Chuyên Bắc Ninh",
                         color=styles.SUBHEADING_COLOR,
                         font_size=styles.H3_FONT_SIZE,
-                        font_weight=styles.BOLD_WEIGHT
+                        font_weight=styles.BOLD_WEIGHT,
                     ),
                     pc.text(
                         "tham gia",
@@ -61,7 +66,7 @@ def footer(style=footer_style):
                         "Cuộc thi Học sinh, sinh viên với ý tưởng khởi nghiệp lần thứ V",
                         color=styles.SUBHEADING_COLOR,
                         font_size=styles.H4_FONT_SIZE,
-                        font_weight=styles.BOLD_WEIGHT
+                        font_weight=styles.BOLD_WEIGHT,
                     ),
                     align_items="start",
                 ),
@@ -88,5 +93,16 @@ def footer(style=footer_style):
                 min_width="100%",
             ),
         ),
-        **style,
     )
+
+
+def footer(style=footer_style):
+    """Create the footer.
+
+    The footer contents compile once into the shared FooterComp component, so
+    pages only differ in the style of the wrapping box.
+
+    Args:
+        style: The style to apply to the footer.
+    """
+    return pc.box(footer_comp(), **style)
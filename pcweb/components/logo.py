@@ -1,8 +1,7 @@
 """The Pynecone logo component."""
 
-import pynecone as pc
-
 from pcweb import styles
+from pcweb.components.media import picture
 
 
 def logo(**style_props):
@@ -11,8 +10,8 @@ def logo(**style_props):
     Args:
         style_props: The style properties to apply to the component.
     """
-    return pc.image(
-        src=styles.LOGO_URL,
+    return picture(
+        styles.LOGO_URL,
         **style_props,
     )
 
@@ -23,7 +22,7 @@ def navbar_logo(**style_props):
     Args:
         style_props: The style properties to apply to the component.
     """
-    return pc.image(
-        src=styles.NAVBAR_LOGO,
+    return picture(
+        styles.NAVBAR_LOGO,
         **style_props,
     )
@@ -0,0 +1,255 @@
+"""Components for optimized media."""
+
+from __future__ import annotations
+
+import pynecone as pc
+
+from pcweb import client, constants
+from pcweb.media import MediaSource, hashed_url, variants
+
+# The image types to offer browsers, in order of preference.
+IMAGE_TYPES = ("image/avif", "image/webp")
+
+
+class Video(pc.Box):
+    """A native HTML video, styled like other components."""
+
+    # The image to show until the video plays.
+    poster: pc.Var[str]
+
+    # Whether to play the video as soon as it can.
+    auto_play: pc.Var[bool]
+
+    # Whether to play the video again when it ends.
+    loop: pc.Var[bool]
+
+    # Whether the video is muted, which browsers need to autoplay it.
+    muted: pc.Var[bool]
+
+    # Whether to play the video inline on mobile, instead of fullscreen.
+    plays_inline: pc.Var[bool]
+
+    # How much of the video to load before it plays.
+    preload: pc.Var[str]
+
+
+class Source(pc.Component):
+    """A source of a native HTML media element."""
+
+    tag = "source"
+
+    # The URL of the source.
+    src: pc.Var[str]
+
+    # The MIME type of the source.
+    type_: pc.Var[str]
+
+    # The candidate images of the source, with their widths.
+    src_set: pc.Var[str]
+
+    # The width the image is rendered at, to pick a candidate with.
+    sizes: pc.Var[str]
+
+
+class ResponsiveImage(pc.Image):
+    """An image that picks a candidate for the width it is rendered at."""
+
+    # The width the image is rendered at, to pick a candidate with.
+    sizes: pc.Var[str]
+
+
+class LazyVideo(Video):
+    """A video whose poster and sources load once it is near the viewport."""
+
+    library = client.library("lazy")
+
+    tag = "LazyVideo"
+
+    # A tiny image to show until the poster loads.
+    placeholder: pc.Var[str]
+
+    # How close to the viewport the video starts loading.
+    root_margin: pc.Var[str]
+
+
+class LazyBackground(pc.Stack):
+    """A stack whose background image loads once it is near the viewport."""
+
+    library = client.library("lazy")
+
+    tag = "LazyBackground"
+
+    # The URL of the background image.
+    src: pc.Var[str]
+
+    # A tiny image to show until the background loads.
+    placeholder: pc.Var[str]
+
+    # The size to stretch the placeholder to, if the background has none.
+    placeholder_size: pc.Var[str]
+
+    # How close to the viewport the background starts loading.
+    root_margin: pc.Var[str]
+
+
+# Convenience methods to create the components.
+video = Video.create
+source = Source.create
+responsive_image = ResponsiveImage.create
+lazy_video = LazyVideo.create
+
+
+def src_set(sources: list[MediaSource]) -> str:
+    """Format image variants as a srcset.
+
+    Args:
+        sources: The variants of one type.
+
+    Returns:
+        The srcset of the variants.
+    """
+    return ", ".join(f"{variant.src} {variant.width}w" for variant in sources)
+
+
+def picture(
+    src: str, sizes: str | None = None, lazy: bool = False, **props
+) -> pc.Component:
+    """Show an image as its optimized variants, if there are any.
+
+    Browsers pick the smallest variant in the best format they support for
+    the width the image is rendered at.
+
+    Args:
+        src: The URL of the image.
+        sizes: The width the image is rendered at. Defaults to its width prop,
+            or the width of the viewport.
+        lazy: Whether to only load the image once it is near the viewport,
+            showing its placeholder until then.
+        props: Props to apply to the image.
+
+    Returns:
+        The picture, or the image if it wasn't optimized.
+    """
+    entry = variants(src)
+    if lazy:
+        props["loading"] = "lazy"
+        if entry is not None and entry.placeholder is not None:
+            props.setdefault("background_image", entry.placeholder)
+            props.setdefault("background_size", "cover")
+    if entry is None or not entry.sources:
+        return pc.image(src=hashed_url(src), **props)
+    if sizes is None:
+        width = props.get("width")
+        sizes = width if isinstance(width, str) else "100vw"
+    return pc.box(
+        *[
+            source(
+                type_=type_,
+                src_set=src_set([v for v in entry.sources if v.type == type_]),
+                sizes=sizes,
+            )
+            for type_ in IMAGE_TYPES
+            if any(v.type == type_ for v in entry.sources)
+        ],
+        responsive_image(src=hashed_url(src), sizes=sizes, **props),
+        element="picture",
+    )
+
+
+def background(src: str, width: int | list[int]) -> str | list[str]:
+    """Get the image to use as a background, for the width it is shown at.
+
+    Args:
+        src: The URL of the image.
+        width: The width the background is shown at, in CSS pixels, or a
+            list of widths for each breakpoint.
+
+    Returns:
+        The URL of the smallest WebP variant covering the width on high
+        density screens, or a list of them for each breakpoint.
+    """
+    if isinstance(width, list):
+        return [background(src, w) for w in width]
+    entry = variants(src)
+    if entry is None:
+        return src
+    candidates = [v for v in entry.sources if v.type == "image/webp"]
+    for variant in candidates:
+        if variant.width >= 2 * width:
+            return variant.src
+    return candidates[-1].src if candidates else hashed_url(src)
+
+
+def lazy_background(
+    *children: pc.Component, src: str, display_width: int, **props
+) -> pc.Component:
+    """Create a stack whose background image loads near the viewport.
+
+    Until then, the stack shows the placeholder of the image, stretched over
+    the area the image will cover.
+
+    Args:
+        children: The children of the stack.
+        src: The URL of the image.
+        display_width: The width the background is shown at, in CSS pixels.
+        props: Props to apply to the stack.
+
+    Returns:
+        The stack.
+    """
+    url = background(src, display_width)
+    entry = variants(src)
+    if entry is not None and entry.placeholder is not None:
+        props["placeholder"] = entry.placeholder
+        if "background_size" not in props:
+            # Cover the natural size of the image, which it is shown at.
+            for variant in entry.sources:
+                if variant.src == url:
+                    props["placeholder_size"] = f"{variant.width}px auto"
+    return LazyBackground.create(
+        *children,
+        src=url,
+        root_margin=constants.LAZY_MEDIA_MARGIN,
+        **props,
+    )
+
+
+def animation(src: str, lazy: bool = False, **props) -> pc.Component:
+    """Show an animated GIF as its optimized video variants, if there are any.
+
+    The videos loop silently like the GIF, and show its still image as the
+    poster until they load.
+
+    Args:
+        src: The URL of the GIF.
+        lazy: Whether to only load the video and its poster once it is near
+            the viewport, showing its placeholder until then.
+        props: Props to apply to the animation.
+
+    Returns:
+        The video, or the GIF if it wasn't optimized.
+    """
+    entry = variants(src)
+    if entry is None or not entry.sources:
+        if lazy:
+            props["loading"] = "lazy"
+        return pc.image(src=hashed_url(src), **props)
+    if entry.poster is not None:
+        props["poster"] = hashed_url(entry.poster)
+    create = video
+    if lazy:
+        create = lazy_video
+        props["root_margin"] = constants.LAZY_MEDIA_MARGIN
+        if entry.placeholder is not None:
+            props["placeholder"] = entry.placeholder
+    else:
+        props["element"] = "video"
+    return create(
+        *[source(src=variant.src, type_=variant.type) for variant in entry.sources],
+        auto_play=True,
+        loop=True,
+        muted=True,
+        plays_inline=True,
+        preload="metadata",
+        **props,
+    )
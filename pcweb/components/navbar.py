@@ -1,12 +1,14 @@
 """UI and logic for the navbar component."""
 
 import pynecone as pc
+from pynecone.event import EVENT_ARG
 
-from pcweb import constants, styles
+from pcweb import client, constants, styles
 from pcweb.base_state import State
 from pcweb.components.logo import logo
-from pcweb.components.sidebar import sidebar as sb
-from pcweb.pages.index import index
+from pcweb.components.sidebar import calculate_index, sidebar_comp
+from pcweb.pages import index_route
+from pcweb.search import index_url, search
 
 
 class NavbarState(State):
@@ -28,14 +30,74 @@ class NavbarState(State):
 
     @pc.var
     def search_results(self) -> list[dict[str, dict[str, str]]]:
-        if self.search_input == "":
-            return []
-        search_parameters = {
-            "q": self.search_input,
-            "query_by": "heading, description",
-            "query_by_weights": "2,1",
-            "sort_by": "_text_match:desc",
-        }
+        """Get the pages matching the search input.
+
+        This is only recomputed when the search input changes.
+        """
+        return search(self.search_input)
+
+
+class DebounceInput(pc.Component):
+    """An input that only reports its value once typing pauses."""
+
+    library = client.library("debounce_input")
+
+    tag = "DebounceInput"
+
+    # The placeholder text.
+    placeholder: pc.Var[str]
+
+    # How long to wait after the last keystroke, in milliseconds.
+    debounce_timeout: pc.Var[int]
+
+    @classmethod
+    def get_controlled_triggers(cls) -> dict[str, pc.Var]:
+        """Get the event triggers that pass the component's value to the handler.
+
+        Returns:
+            A dict mapping the event trigger to the var that is passed to the handler.
+        """
+        return {"on_change": EVENT_ARG.target.value}
+
+
+# Convenience method to create the component.
+debounce_input = DebounceInput.create
+
+
+class LocalSearch(pc.Component):
+    """A search input and its results, searched in the browser."""
+
+    library = client.library("search")
+
+    tag = "LocalSearch"
+
+    # The URL of the compressed search index.
+    index_url: pc.Var[str]
+
+    # The placeholder text.
+    placeholder: pc.Var[str]
+
+    # The maximum number of results to show.
+    limit: pc.Var[int]
+
+    # The color of the result headings.
+    heading_color: pc.Var[str]
+
+    # The color of the result descriptions.
+    text_color: pc.Var[str]
+
+    @classmethod
+    def get_triggers(cls) -> set[str]:
+        """Get the event triggers for the component.
+
+        Returns:
+            The event triggers.
+        """
+        return super().get_triggers() | {"on_select"}
+
+
+# Convenience method to create the component.
+local_search = LocalSearch.create
 
 
 def format_search_results(result):
@@ -77,16 +139,15 @@ button_style = {
 }
 
 
-def navbar(sidebar: pc.Component = None) -> pc.Component:
-    """Create the navbar component.
-
-    Args:
-        sidebar: The sidebar component to use.
-    """
-    # If the sidebar is not provided, create a default one.
-    sidebar = sidebar or sb()
-
-    # Create the navbar component.
+@pc.component
+def navbar_comp(
+    url: pc.Var[str],
+    learn_index: pc.Var[list[int]],
+    examples_index: pc.Var[list[int]],
+    sidebar_open: pc.Var[bool],
+    on_toggle: pc.EventChain,
+    on_search: pc.EventChain,
+) -> pc.Component:
     return pc.box(
         pc.hstack(
             pc.link(
@@ -100,10 +161,19 @@ def navbar(sidebar: pc.Component = None) -> pc.Component:
                     ),
                     spacing="0.25em",
                 ),
-                href=index.path,
+                href=index_route.path,
                 _hover={"text_decoration": "none"},
             ),
             pc.hstack(
+                pc.icon(
+                    tag="SearchIcon",
+                    on_click=on_search,
+                    color=styles.DOC_REG_TEXT_COLOR,
+                    _hover={
+                        "cursor": "pointer",
+                        "color": styles.ACCENT_COLOR,
+                    },
+                ),
                 pc.tablet_and_desktop(
                     pc.link(
                         pc.button(
@@ -154,7 +224,7 @@ def navbar(sidebar: pc.Component = None) -> pc.Component:
                 pc.mobile_and_tablet(
                     pc.icon(
                         tag="HamburgerIcon",
-                        on_click=NavbarState.toggle_sidebar,
+                        on_click=on_toggle,
                         width="1.5em",
                         height="1.5em",
                         _hover={
@@ -172,7 +242,7 @@ def navbar(sidebar: pc.Component = None) -> pc.Component:
                             logo,
                             pc.icon(
                                 tag="CloseIcon",
-                                on_click=NavbarState.toggle_sidebar,
+                                on_click=on_toggle,
                                 width="4em",
                                 _hover={
                                     "cursor": "pointer",
@@ -182,7 +252,13 @@ def navbar(sidebar: pc.Component = None) -> pc.Component:
                             justify="space-between",
                             margin_bottom="1.5em",
                         ),
-                        sidebar if sidebar is not None else pc.text("Sidebar"),
+                        pc.box(
+                            sidebar_comp(
+                                url=url,
+                                learn_index=learn_index,
+                                examples_index=examples_index,
+                            ),
+                        ),
                         padding_x="2em",
                         padding_top="2em",
                         bg="rgba(255,255,255, 0.97)",
@@ -190,8 +266,8 @@ def navbar(sidebar: pc.Component = None) -> pc.Component:
                     bg="rgba(255,255,255, 0.5)",
                 ),
                 placement="left",
-                is_open=NavbarState.sidebar_open,
-                on_close=NavbarState.toggle_sidebar,
+                is_open=sidebar_open,
+                on_close=on_toggle,
                 bg="rgba(255,255,255, 0.5)",
             ),
             justify="space-between",
@@ -206,3 +282,71 @@ def navbar(sidebar: pc.Component = None) -> pc.Component:
         top="0px",
         z_index="99",
     )
+
+
+def search_modal() -> pc.Component:
+    """Create the modal to search the site with.
+
+    The search runs in the browser, from the index emitted with the assets,
+    unless backend search is enabled.
+
+    Returns:
+        The search modal.
+    """
+    if constants.SERVER_SEARCH:
+        contents = [
+            pc.modal_header(
+                debounce_input(
+                    placeholder="Tìm kiếm",
+                    debounce_timeout=constants.SEARCH_DEBOUNCE_MS,
+                    on_change=NavbarState.set_search_input,
+                ),
+            ),
+            pc.modal_body(
+                pc.vstack(
+                    pc.foreach(NavbarState.search_results, format_search_results),
+                    width="100%",
+                ),
+            ),
+        ]
+    else:
+        contents = [
+            pc.modal_body(
+                local_search(
+                    index_url=index_url(),
+                    placeholder="Tìm kiếm",
+                    limit=10,
+                    heading_color=styles.DOC_HEADER_COLOR,
+                    text_color=styles.DOC_REG_TEXT_COLOR,
+                    on_select=NavbarState.change_search,
+                ),
+                padding_y="1em",
+            ),
+        ]
+    return pc.modal(
+        pc.modal_overlay(pc.modal_content(*contents)),
+        is_open=NavbarState.search_modal,
+        on_close=NavbarState.change_search,
+    )
+
+
+def navbar(url: str | None = None) -> pc.Component:
+    """Create the navbar component.
+
+    The navbar compiles once into the shared NavbarComp component, and each
+    page only passes the sidebar URL and state as props.
+
+    Args:
+        url: The URL to open the drawer sidebar at.
+    """
+    return pc.fragment(
+        navbar_comp(
+            url=url or "",
+            learn_index=calculate_index("learn", url),
+            examples_index=calculate_index("examples", url),
+            sidebar_open=NavbarState.sidebar_open,
+            on_toggle=NavbarState.toggle_sidebar,
+            on_search=NavbarState.change_search,
+        ),
+        search_modal(),
+    )
@@ -0,0 +1,27 @@
+"""A hint for browsers to fetch a resource before it is needed."""
+
+import pynecone as pc
+
+
+class Preload(pc.Component):
+    """A link preloading a resource, in the document head."""
+
+    tag = "link"
+
+    # The relation of the link.
+    rel: pc.Var[str]
+
+    # The URL of the resource.
+    href: pc.Var[str]
+
+    # The kind of resource.
+    as_: pc.Var[str]
+
+    # The MIME type of the resource.
+    type_: pc.Var[str]
+
+    # The CORS mode to fetch the resource with, which fonts always use.
+    cross_origin: pc.Var[str]
+
+
+preload = Preload.create
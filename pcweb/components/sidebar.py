@@ -2,12 +2,10 @@
 
 from __future__ import annotations
 
-import inspect
-
 import pynecone as pc
 from pynecone.base import Base
 
-from pcweb import styles
+from pcweb import pages, styles
 from pcweb.component_list import component_list
 from pcweb.route import Route
 
@@ -43,8 +41,16 @@ class SidebarItem(Base):
     children: list[SidebarItem] = []
 
 
-def create_item(route: Route, children=None):
-    """Create a sidebar item from a route."""
+def create_item(route: Route | str, children: list[Route] | None = None):
+    """Create a sidebar item from a route, or a section from a package.
+
+    Args:
+        route: The route of a link, or the dotted name of a section package.
+        children: The routes in the section, if the item is a section.
+
+    Returns:
+        The sidebar item.
+    """
     if children is None:
         name = route.title.split(" | Pynecone")[0]
         if name.endswith("Overview"):
@@ -52,20 +58,129 @@ def create_item(route: Route, children=None):
         name = name.replace("Api", "API")
         return SidebarItem(names=name, link=route.path)
     return SidebarItem(
-        names=inspect.getmodule(route)
-        .__name__.split(".")[-1]
-        .replace("_", " ")
-        .title(),
+        names=route.rpartition(".")[2].replace("_", " ").title(),
         children=list(map(create_item, children)),
     )
 
 
+def get_sidebar_items(package: str) -> list[SidebarItem]:
+    """Create the sidebar items for the registered pages in a package.
+
+    Pages directly in the package become links, and pages in a subpackage are
+    grouped into a section named after it.
+
+    Args:
+        package: The dotted name of the package.
+
+    Returns:
+        The sidebar items.
+    """
+    sections = {}
+    for route in pages.routes:
+        if route.module is None or not route.module.startswith(f"{package}."):
+            continue
+        sections.setdefault(route.module.rpartition(".")[0], []).append(route)
+
+    items = []
+    for section, routes in sections.items():
+        if section == package:
+            items.extend(map(create_item, routes))
+        else:
+            items.append(create_item(section, children=routes))
+    return items
+
+
 def get_sidebar_items_learn():
-    return None
+    return get_sidebar_items("pcweb.pages.docs")
 
 
 def get_sidebar_items_examples():
-    pass
+    return get_sidebar_items("pcweb.pages.examples")
+
+
+class NavigationEntry(Base):
+    """Where a link sits in the sidebar navigation."""
+
+    # The sidebar item of the link.
+    item: SidebarItem
+
+    # The previous and next links.
+    prev: SidebarItem | None = None
+    next: SidebarItem | None = None
+
+    # The names of the sections containing the link, outermost first.
+    ancestors: list[str] = []
+
+    # The sidebar tree containing the link.
+    tree: str = ""
+
+    # The indices of the accordion items to open for the link.
+    index: list[int] = []
+
+
+class NavigationIndex:
+    """Precomputed navigation for every link in the sidebar.
+
+    The sidebar trees are walked once, so looking up the neighbours or the
+    accordion indices of a link takes constant time.
+    """
+
+    def __init__(self, trees: dict[str, list[SidebarItem]]):
+        """Index the sidebar trees.
+
+        Args:
+            trees: The sidebar items of each tree, in navigation order.
+        """
+        self.entries = {}
+        for tree, items in trees.items():
+            self._add(tree, items, [], None)
+
+        # Link each entry to its neighbours across all the trees.
+        entries = list(self.entries.values())
+        for prev, following in zip(entries, entries[1:]):
+            prev.next = following.item
+            following.prev = prev.item
+
+    def _add(
+        self,
+        tree: str,
+        items: list[SidebarItem],
+        ancestors: list[str],
+        index: list[int] | None,
+    ):
+        sections = 0
+        for item in items:
+            if len(item.children) == 0:
+                self.entries.setdefault(
+                    item.link,
+                    NavigationEntry(
+                        item=item,
+                        ancestors=ancestors,
+                        tree=tree,
+                        index=index or [],
+                    ),
+                )
+                continue
+
+            # Only the outermost accordion is opened for the current page.
+            self._add(
+                tree,
+                item.children,
+                [*ancestors, item.names],
+                index if index is not None else [sections],
+            )
+            sections += 1
+
+    def get(self, url: str | None) -> NavigationEntry | None:
+        """Get the navigation entry for a link.
+
+        Args:
+            url: The link to look up.
+
+        Returns:
+            The navigation entry, or None if the link is not in the sidebar.
+        """
+        return self.entries.get(url)
 
 
 @pc.component
@@ -143,36 +258,27 @@ def sidebar_item_comp(
     )
 
 
-def calculate_index(sidebar_items, url):
-    return None
-
-
 learn = get_sidebar_items_learn()
 examples = get_sidebar_items_examples()
 
+# The navigation for every link in the sidebar.
+navigation = NavigationIndex({"learn": learn, "examples": examples})
 
-def get_prev_next(url):
-    """Get the previous and next links in the sidebar."""
-    sidebar_items = learn + examples
-    # Flatten the list of sidebar items
-    flat_items = []
 
-    def append_to_items(items):
-        for item in items:
-            if len(item.children) == 0:
-                flat_items.append(item)
-            append_to_items(item.children)
+def calculate_index(tree, url):
+    """Get the indices of the accordion items to open in a sidebar tree."""
+    entry = navigation.get(url)
+    if entry is None or entry.tree != tree:
+        return []
+    return entry.index
 
-    append_to_items(sidebar_items)
-    for i, item in enumerate(flat_items):
-        if item.link == url:
-            if i == 0:
-                return None, flat_items[i + 1]
-            elif i == len(flat_items) - 1:
-                return flat_items[i - 1], None
-            else:
-                return flat_items[i - 1], flat_items[i + 1]
-    return None, None
+
+def get_prev_next(url):
+    """Get the previous and next links in the sidebar."""
+    entry = navigation.get(url)
+    if entry is None:
+        return None, None
+    return entry.prev, entry.next
 
 
 @pc.component
@@ -219,9 +325,13 @@ def sidebar_comp(
 
 
 def sidebar(url=None) -> pc.Component:
-    """Render the sidebar."""
-    learn_index = calculate_index(learn, url)
-    examples_index = calculate_index(examples, url)
+    """Render the sidebar.
+
+    Its contents compile once into the shared SidebarComp component, which
+    each page only references with props.
+    """
+    learn_index = calculate_index("learn", url)
+    examples_index = calculate_index("examples", url)
     return pc.box(
         sidebar_comp(
             url=url,
@@ -1,5 +1,7 @@
 # pcweb constants.
 
+import os
+
 # pcweb urls.
 PIP_URL = "https://pypi.org/project/pynecone"
 GITHUB_URL = "https://github.com/pynecone-io/pynecone"
@@ -17,3 +19,96 @@ VENV_URL = "https://docs.python.org/3/library/venv.html"
 VIRTUALENV_URL = "https://virtualenv.pypa.io/en/latest/"
 CONDA_URL = "https://docs.conda.io/en/latest/"
 FASTAPI_URL = "https://fastapi.tiangolo.com"
+
+# Build directories.
+ASSETS_DIR = "assets"
+OPTIMIZED_ASSETS_DIR = os.path.join(ASSETS_DIR, "optimized")
+BUILD_DIR = os.environ.get("PCWEB_BUILD_DIR", ".pcweb")
+MEDIA_MANIFEST_PATH = os.path.join(BUILD_DIR, "media.json")
+BLACK_CACHE_DIR = os.path.join(BUILD_DIR, "black")
+MANIFEST_PATH = os.path.join(BUILD_DIR, "manifest.json")
+PROFILE_PATH = os.path.join(BUILD_DIR, "profile.json")
+SEARCH_INDEX_PATH = os.path.join(BUILD_DIR, "search_index.json")
+
+# The Cache-Control header of the assets named by their hash, which never change.
+HASHED_ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# The compressed search index served to the browser, from the assets dir.
+SEARCH_ASSET = "search_index.json.gz"
+SEARCH_ASSET_DIR = "optimized/search"
+
+# Whether to only compile the pages that changed since the last compile.
+INCREMENTAL_COMPILE = os.environ.get("PCWEB_INCREMENTAL", "") == "1"
+
+# Whether to search on the backend instead of in the browser.
+SERVER_SEARCH = os.environ.get("PCWEB_SERVER_SEARCH", "") == "1"
+
+# Whether to profile the imports and page construction at startup.
+PROFILE_STARTUP = os.environ.get("PCWEB_PROFILE", "") == "1"
+
+# The maximum size of the black cache before old entries are evicted.
+BLACK_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# The connection pool of the database, when it isn't SQLite.
+DB_POOL_SIZE = int(os.environ.get("PCWEB_DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("PCWEB_DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.environ.get("PCWEB_DB_POOL_TIMEOUT", "30"))
+
+# The longest a database statement may run, in milliseconds.
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("PCWEB_DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+# How long to wait for more waitlist signups before writing them, in milliseconds.
+WAITLIST_FLUSH_MS = 500
+
+# The most waitlist signups to write in one transaction.
+WAITLIST_BATCH_SIZE = 100
+
+# The most recent waitlist emails each worker remembers, to skip repeat signups.
+WAITLIST_SEEN_SIZE = 10000
+
+# The number of waitlist rows to fetch at a time when exporting.
+WAITLIST_EXPORT_CHUNK_SIZE = 10000
+
+# How long to wait for the DNS lookups of an email domain, in seconds.
+EMAIL_DNS_TIMEOUT = 5
+
+# How long to cache whether an email domain accepts mail, in seconds.
+EMAIL_DOMAIN_TTL = 60 * 60
+
+# How long to cache that an email domain doesn't accept mail, in seconds. A
+# failing name server looks the same as a missing domain, so this is short.
+EMAIL_DOMAIN_NEGATIVE_TTL = 60
+
+# The number of email domains to cache.
+EMAIL_DOMAIN_CACHE_SIZE = 10000
+
+# The number of threads to look up email domains in.
+EMAIL_VALIDATION_WORKERS = 8
+
+# The height to downscale the gallery videos to, twice their rendered height.
+GALLERY_VIDEO_HEIGHT = 576
+
+# The self-hosted fonts, and the API to fetch them from at build time.
+FONT_MANIFEST_PATH = os.path.join(BUILD_DIR, "fonts.json")
+FONTS_API_URL = "https://fonts.googleapis.com/css2"
+
+# The web fonts that can be self-hosted, with the weights they come in.
+WEB_FONTS = {
+    "Inter": (100, 200, 300, 400, 500, 600, 700, 800, 900),
+    "Silkscreen": (400, 700),
+}
+
+# The widths to resize images to, in pixels, when they are wider.
+IMAGE_WIDTHS = (160, 320, 640, 960, 1280, 1920)
+
+# The width of the placeholders shown until media loads, in pixels.
+PLACEHOLDER_WIDTH = 16
+
+# How close to the viewport lazy media starts loading, as a CSS margin.
+LAZY_MEDIA_MARGIN = "200px"
+
+# The number of search queries to keep results for.
+SEARCH_CACHE_SIZE = 256
+
+# How long to wait after the last keystroke before searching, in milliseconds.
+SEARCH_DEBOUNCE_MS = 300
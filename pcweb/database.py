@@ -0,0 +1,88 @@
+"""The database engine shared by the app.
+
+The database is selected by the `PCWEB_DB` profile in `pcconfig.py`. Its
+engine is created once per process, with a pool of connections that are
+checked before use, so each app worker reuses its connections across
+requests.
+"""
+
+import functools
+
+import pynecone as pc
+import sqlalchemy
+import sqlmodel
+
+from pcweb import constants
+
+
+def _configure_sqlite(connection, _):
+    """Let readers and the writer of a SQLite database run concurrently.
+
+    Args:
+        connection: The new DBAPI connection.
+    """
+    cursor = connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={constants.DB_STATEMENT_TIMEOUT_MS}")
+    cursor.close()
+
+
+def create_engine(url: str) -> sqlalchemy.engine.Engine:
+    """Create an engine for a database.
+
+    Args:
+        url: The database url.
+
+    Returns:
+        The database engine.
+    """
+    if url.startswith("sqlite"):
+        engine = sqlmodel.create_engine(url, echo=False, pool_pre_ping=True)
+        sqlalchemy.event.listen(engine, "connect", _configure_sqlite)
+        return engine
+
+    connect_args = {}
+    if url.startswith("postgresql"):
+        timeout = constants.DB_STATEMENT_TIMEOUT_MS
+        connect_args["options"] = f"-c statement_timeout={timeout}"
+    return sqlmodel.create_engine(
+        url,
+        echo=False,
+        pool_size=constants.DB_POOL_SIZE,
+        max_overflow=constants.DB_MAX_OVERFLOW,
+        pool_timeout=constants.DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_engine() -> sqlalchemy.engine.Engine:
+    """Get the database engine, creating it once per process.
+
+    Unlike `pc.model.get_engine`, this reuses the engine and its connections
+    across calls.
+
+    Returns:
+        The database engine.
+
+    Raises:
+        ValueError: If the database url is None.
+    """
+    url = pc.utils.get_config().db_url
+    if url is None:
+        raise ValueError("No database url in config")
+    return create_engine(url)
+
+
+def session(engine: sqlalchemy.engine.Engine | None = None) -> sqlmodel.Session:
+    """Get a session on an engine.
+
+    Args:
+        engine: The engine to use. Defaults to the shared engine.
+
+    Returns:
+        A database session.
+    """
+    return sqlmodel.Session(engine or get_engine())
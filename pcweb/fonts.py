@@ -0,0 +1,407 @@
+"""Self-host the web fonts, subset to the text of the site.
+
+The fonts are fetched at build time, with only the families and weights the
+pcweb package references, and only the glyphs it can show: printable ASCII
+and the Vietnamese alphabet, for text typed into inputs, and every character
+in the string literals of the package, which hold the page text. They are
+written to the optimized assets dir, in directories named by their hashes,
+along with a stylesheet declaring them, and listed in a manifest in the
+build dir. Pages link to the stylesheet and preload the fonts of the default
+weights, so they never wait on a font CDN.
+
+The stage needs network access to the Google Fonts API, which subsets the
+fonts. Requests whose families, weights and text are unchanged are skipped.
+Run it with `python -m pcweb.fonts`.
+"""
+
+from __future__ import annotations
+
+import ast
+import functools
+import hashlib
+import http.client
+import json
+import os
+import re
+import string
+import unicodedata
+import urllib.parse
+import urllib.request
+from typing import List, Optional
+
+from pynecone.base import Base
+
+from pcweb import constants, styles
+from pcweb.media import asset_path, asset_url, hashed_dir
+
+# The weights of the theme tokens, which components can use by name.
+WEIGHT_TOKENS = {
+    "hairline": 100,
+    "thin": 200,
+    "light": 300,
+    "normal": 400,
+    "medium": 500,
+    "semibold": 600,
+    "bold": 700,
+    "extrabold": 800,
+    "black": 900,
+}
+
+# The weights the theme uses without being asked: for text, buttons and headings.
+DEFAULT_WEIGHTS = {400, 600, 700}
+
+# The props that set the font family and weight, in Python and in JavaScript.
+FAMILY_PROPS = ("font_family", "fontFamily")
+WEIGHT_PROPS = ("font_weight", "fontWeight")
+
+# The browser to request the fonts as, so the API serves WOFF2.
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+# The declarations of the fonts in the stylesheet served by the API.
+FONT_FACE = re.compile(r"@font-face\s*{([^}]*)}")
+
+# The declaration of a self-hosted font.
+FONT_FACE_TEMPLATE = """@font-face {
+  font-family: "%s";
+  font-style: normal;
+  font-weight: %d;
+  font-display: swap;
+  src: url(%s) format("woff2");
+}
+"""
+
+
+class FontFace(Base):
+    """A self-hosted font."""
+
+    # The family of the font.
+    family: str
+
+    # The weight of the font.
+    weight: int
+
+    # The URL of the font file.
+    src: str
+
+
+class FontManifest(Base):
+    """The self-hosted fonts and the stylesheet declaring them."""
+
+    # The hash of the request the fonts were fetched with.
+    request_hash: str = ""
+
+    # The URL of the stylesheet.
+    stylesheet: Optional[str] = None
+
+    # The fonts.
+    faces: List[FontFace] = []
+
+    @classmethod
+    def load(cls, path: str = constants.FONT_MANIFEST_PATH) -> FontManifest:
+        """Load the manifest, or an empty one if there is none.
+
+        Args:
+            path: The path to load the manifest from.
+
+        Returns:
+            The manifest.
+        """
+        if not os.path.isfile(path):
+            return cls()
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def save(self, path: str = constants.FONT_MANIFEST_PATH):
+        """Write the manifest.
+
+        Args:
+            path: The path to write the manifest to.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.dict(), f, indent=2, sort_keys=True)
+
+
+def vietnamese_alphabet() -> set[str]:
+    """Get the letters of the Vietnamese alphabet that aren't ASCII.
+
+    Returns:
+        The vowels with each of their tone marks, and đ, in both cases.
+    """
+    tones = ("", "\u0300", "\u0301", "\u0303", "\u0309", "\u0323")
+    letters = {
+        unicodedata.normalize("NFC", vowel + tone)
+        for vowel in "aăâeêioôơuưy"
+        for tone in tones
+    }
+    letters.add("đ")
+    return letters | {letter.upper() for letter in letters}
+
+
+def weight(value) -> int | None:
+    """Get the numeric font weight of a prop value.
+
+    Args:
+        value: The value of a font weight prop.
+
+    Returns:
+        The weight, or None if it isn't a weight.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        if value.isdigit():
+            return int(value)
+        return WEIGHT_TOKENS.get(value)
+    return None
+
+
+class _FontCollector(ast.NodeVisitor):
+    """Find the text, font families and font weights of a module."""
+
+    def __init__(self):
+        self.text = set()
+        self.families = set()
+        self.weights = set()
+
+    def resolve(self, node: ast.expr):
+        # Props are set to literals, or to the constants in styles.py.
+        if isinstance(node, ast.Constant):
+            return node.value
+        if (
+            isinstance(node, ast.Attribute)
+            and isinstance(node.value, ast.Name)
+            and node.value.id == "styles"
+        ):
+            return getattr(styles, node.attr, None)
+        if isinstance(node, ast.Name):
+            return getattr(styles, node.id, None)
+        return None
+
+    def add(self, prop: str | None, node: ast.expr):
+        value = self.resolve(node)
+        if prop in FAMILY_PROPS and isinstance(value, str):
+            self.families |= {family.strip(" '\"") for family in value.split(",")}
+        elif prop in WEIGHT_PROPS and weight(value) is not None:
+            self.weights.add(weight(value))
+
+    def visit_Constant(self, node: ast.Constant):
+        if isinstance(node.value, str):
+            self.text.update(node.value)
+
+    def visit_keyword(self, node: ast.keyword):
+        self.add(node.arg, node.value)
+        self.generic_visit(node)
+
+    def visit_Dict(self, node: ast.Dict):
+        for key, value in zip(node.keys, node.values):
+            if isinstance(key, ast.Constant):
+                self.add(key.value, value)
+        self.generic_visit(node)
+
+
+def collect(
+    directory: str = os.path.dirname(__file__),
+) -> tuple[dict[str, list[int]], str]:
+    """Find the fonts and glyphs the site uses.
+
+    Args:
+        directory: The package to search.
+
+    Returns:
+        The weights of each web font referenced, and the text to subset to.
+    """
+    collector = _FontCollector()
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            if filename.endswith(".py"):
+                with open(path, encoding="utf-8") as f:
+                    collector.visit(ast.parse(f.read()))
+            elif filename.endswith(".js"):
+                with open(path, encoding="utf-8") as f:
+                    for value in re.findall(r"fontWeight[=:]\s*[{\"']*(\w+)", f.read()):
+                        if weight(value) is not None:
+                            collector.weights.add(weight(value))
+
+    weights = collector.weights | DEFAULT_WEIGHTS
+    fonts = {
+        family: sorted(weights & set(available))
+        for family, available in constants.WEB_FONTS.items()
+        if family in collector.families
+    }
+    text = set(string.digits + string.ascii_letters + string.punctuation + " ")
+    text |= vietnamese_alphabet()
+    text |= {c for c in collector.text if c.isprintable() and not c.isspace()}
+    return fonts, "".join(sorted(text))
+
+
+def api_url(fonts: dict[str, list[int]], text: str) -> str:
+    """Get the URL of the stylesheet declaring the subset fonts.
+
+    Args:
+        fonts: The weights of each family.
+        text: The text to subset the fonts to.
+
+    Returns:
+        The URL.
+    """
+    query = [
+        ("family", f"{family}:wght@{';'.join(str(w) for w in weights)}")
+        for family, weights in fonts.items()
+    ]
+    query.append(("text", text))
+    return f"{constants.FONTS_API_URL}?{urllib.parse.urlencode(query)}"
+
+
+def fetch(url: str) -> bytes:
+    """Download a file from the fonts API.
+
+    Args:
+        url: The URL of the file.
+
+    Returns:
+        The contents of the file.
+    """
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def write(kind: str, filename: str, data: bytes) -> str:
+    """Write a file to a directory named by its hash.
+
+    Args:
+        kind: The kind of file.
+        filename: The name of the file.
+        data: The contents of the file.
+
+    Returns:
+        The URL of the file.
+    """
+    path = os.path.join(hashed_dir(kind, hashlib.sha256(data).hexdigest()), filename)
+    with open(path, "wb") as f:
+        f.write(data)
+    return asset_url(path)
+
+
+def parse_face(declaration: str) -> tuple[str, int, str] | None:
+    """Read the family, weight and URL of a font declared by the API.
+
+    Args:
+        declaration: The body of the @font-face rule.
+
+    Returns:
+        The family, weight and URL of the font, or None if it doesn't declare
+        a family, a single numeric weight and a URL.
+    """
+    props = dict(
+        line.strip().rstrip(";").split(":", 1)
+        for line in declaration.strip().splitlines()
+        if ":" in line
+    )
+    props = {name.strip(): value.strip() for name, value in props.items()}
+    src = re.search(r"url\((.+?)\)", props.get("src", ""))
+    face_weight = props.get("font-weight", "")
+    if "font-family" not in props or not face_weight.isdigit() or src is None:
+        return None
+    return props["font-family"].strip("'\""), int(face_weight), src.group(1)
+
+
+def build() -> FontManifest:
+    """Fetch the subset fonts and write them with their stylesheet.
+
+    Returns:
+        The updated manifest.
+    """
+    current = FontManifest.load()
+    fonts, text = collect()
+    url = api_url(fonts, text)
+    request_hash = hashlib.sha256(url.encode()).hexdigest()
+    if (
+        current.request_hash == request_hash
+        and current.stylesheet is not None
+        and all(os.path.isfile(asset_path(face.src)) for face in current.faces)
+    ):
+        return current
+
+    try:
+        css = fetch(url).decode()
+        faces = []
+        for declaration in FONT_FACE.findall(css):
+            face = parse_face(declaration)
+            if face is None:
+                print(f"Skipped a font that could not be read: {declaration.strip()}")
+                continue
+            family, face_weight, src = face
+            faces.append(
+                FontFace(
+                    family=family,
+                    weight=face_weight,
+                    src=write(
+                        "fonts",
+                        f"{family.replace(' ', '')}-{face_weight}.woff2",
+                        fetch(src),
+                    ),
+                )
+            )
+    except (OSError, http.client.HTTPException, UnicodeDecodeError) as e:
+        # Network errors and timeouts are OSErrors.
+        print(f"Could not fetch the fonts ({e!r}), so they were not self-hosted.")
+        return current
+
+    stylesheet = "".join(
+        FONT_FACE_TEMPLATE % (face.family, face.weight, face.src) for face in faces
+    )
+    manifest = FontManifest(
+        request_hash=request_hash,
+        stylesheet=write("fonts", "fonts.css", stylesheet.encode()),
+        faces=faces,
+    )
+    manifest.save()
+    print(
+        f"Self-hosted {len(faces)} fonts subset to {len(text)} characters: "
+        + ", ".join(f"{family} {weights}" for family, weights in fonts.items())
+    )
+    return manifest
+
+
+@functools.lru_cache(maxsize=None)
+def manifest() -> FontManifest:
+    """Get the manifest written by the last build.
+
+    Returns:
+        The manifest.
+    """
+    return FontManifest.load()
+
+
+def stylesheets() -> list[str]:
+    """Get the stylesheets declaring the fonts.
+
+    Returns:
+        The self-hosted stylesheet, or the Google Fonts stylesheets if the
+        fonts weren't built.
+    """
+    if manifest().stylesheet is None:
+        return styles.STYLESHEETS
+    return [manifest().stylesheet]
+
+
+def preloads() -> list[str]:
+    """Get the fonts for browsers to fetch before they are needed.
+
+    Only the weights the theme uses everywhere are preloaded, since the
+    others may not be needed by a page at all.
+
+    Returns:
+        The URLs of the self-hosted fonts of the default weights.
+    """
+    return [face.src for face in manifest().faces if face.weight in DEFAULT_WEIGHTS]
+
+
+if __name__ == "__main__":
+    build()
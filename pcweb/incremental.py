@@ -0,0 +1,331 @@
+"""Incremental compilation of the app pages."""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+from importlib import metadata, util
+
+import pynecone as pc
+from pynecone.base import Base
+from pynecone.compiler import compiler
+from pynecone.compiler import utils as compiler_utils
+
+from pcweb import constants
+from pcweb.route import Route
+
+# Modules that affect every page, even though pages do not import them.
+SHARED_MODULES = ["pcweb.styles", "pcweb.base_state"]
+
+# The module that creates the app and adds the pages, with their metadata. Its
+# source affects every page, but not its imports, which include every page.
+APP_MODULE = "pcweb.pcweb"
+
+# Build outputs that pages read, by the module that reads them.
+MODULE_INPUTS = {
+    "pcweb.media": [constants.MEDIA_MANIFEST_PATH],
+    "pcweb.search": [constants.SEARCH_INDEX_PATH],
+}
+
+
+def _package_root() -> str:
+    """Get the directory containing the pcweb package, without importing it."""
+    spec = util.find_spec("pcweb")
+    return os.path.dirname(os.path.dirname(spec.origin))
+
+
+def module_file(name: str) -> str | None:
+    """Get the source file of a pcweb module without importing it.
+
+    Args:
+        name: The dotted name of the module.
+
+    Returns:
+        The path of the source file, or None if it is not a module.
+    """
+    path = os.path.join(_package_root(), *name.split("."))
+    for file in (path + ".py", os.path.join(path, "__init__.py")):
+        if os.path.isfile(file):
+            return file
+    return None
+
+
+def _read(name: str) -> bytes:
+    file = module_file(name)
+    if file is None:
+        return b""
+    with open(file, "rb") as f:
+        return f.read()
+
+
+def imports(name: str) -> set[str]:
+    """Get the pcweb modules that a module imports directly.
+
+    Args:
+        name: The dotted name of the module.
+
+    Returns:
+        The names of the imported pcweb modules.
+    """
+    file = module_file(name)
+    if file is None:
+        return set()
+    package = name if file.endswith("__init__.py") else name.rpartition(".")[0]
+
+    found = set()
+    for node in ast.walk(ast.parse(_read(name))):
+        if isinstance(node, ast.Import):
+            found |= {alias.name for alias in node.names}
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package.rsplit(".", node.level - 1)[0]
+                base = f"{base}.{node.module}" if node.module else base
+            else:
+                base = node.module or ""
+            found.add(base)
+
+            # `from pcweb import styles` imports the styles module.
+            found |= {f"{base}.{alias.name}" for alias in node.names}
+
+    return {
+        module
+        for module in found
+        if module.split(".")[0] == "pcweb"
+        and module != name
+        and module_file(module) is not None
+    }
+
+
+def dependencies(name: str) -> set[str]:
+    """Get a module and every pcweb module it transitively imports.
+
+    Parent packages are included since importing a submodule runs them, but
+    their own imports are not followed. Otherwise every page would depend on
+    its siblings through `pcweb.pages`.
+
+    Args:
+        name: The dotted name of the module.
+
+    Returns:
+        The names of the modules.
+    """
+    seen = set()
+    stack = [name]
+    while stack:
+        module = stack.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        stack.extend(imports(module) - seen)
+
+    parents = set()
+    for module in seen:
+        parts = module.split(".")
+        parents |= {".".join(parts[:i]) for i in range(1, len(parts))}
+    return seen | parents
+
+
+def source_hash(name: str) -> str:
+    """Hash the source of a single module.
+
+    Args:
+        name: The dotted name of the module.
+
+    Returns:
+        The hex digest of the source.
+    """
+    return hashlib.sha256(_read(name)).hexdigest()
+
+
+def state_hash(app: pc.App) -> str:
+    """Hash the parts of the app state that are compiled into every page.
+
+    Every page embeds the initial values of the whole state tree, and its
+    event handlers, so a var added in any page module changes every page.
+
+    Args:
+        app: The app.
+
+    Returns:
+        The hex digest of the compiled state.
+    """
+    compiled = (
+        compiler_utils.compile_state(app.state),
+        compiler_utils.compile_events(app.state),
+        compiler_utils.compile_effects(app.state),
+    )
+    return hashlib.sha256("\n".join(compiled).encode()).hexdigest()
+
+
+def fingerprint(name: str, app_hash: str = "") -> str:
+    """Fingerprint a page module and everything in pcweb it depends on.
+
+    Args:
+        name: The dotted name of the page module.
+        app_hash: A hash of the inputs shared by every page of the app.
+
+    Returns:
+        The hex digest of the page inputs.
+    """
+    modules = dependencies(name)
+    for shared in SHARED_MODULES:
+        modules |= dependencies(shared)
+
+    digest = hashlib.sha256(metadata.version("pynecone").encode())
+    digest.update(app_hash.encode())
+    for module in sorted(modules):
+        digest.update(module.encode())
+        digest.update(source_hash(module).encode())
+        for path in MODULE_INPUTS.get(module, []):
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def page_module(route: Route) -> str:
+    """Get the module defining a route's page.
+
+    Args:
+        route: The route.
+
+    Returns:
+        The dotted name of the module.
+    """
+    return route.module or route.component.__module__
+
+
+class Manifest(Base):
+    """What the previous incremental compile wrote."""
+
+    # The fingerprint of each compiled page, by formatted route.
+    pages: dict[str, str] = {}
+
+    # The source hash of each module the pages depend on.
+    modules: dict[str, str] = {}
+
+    # The tags of the custom components that were compiled.
+    components: list[str] = []
+
+    @classmethod
+    def load(cls, path: str = constants.MANIFEST_PATH) -> Manifest:
+        """Load the manifest, or an empty one if there is none.
+
+        Args:
+            path: The path to load the manifest from.
+
+        Returns:
+            The manifest.
+        """
+        try:
+            with open(path) as f:
+                return cls.parse_obj(json.load(f))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path: str = constants.MANIFEST_PATH):
+        """Save the manifest.
+
+        Args:
+            path: The path to save the manifest to.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.dict(), f, indent=2)
+
+
+def _compile_pages(app: pc.App, paths: list[str]) -> set:
+    """Compile the pages of the given routes.
+
+    Args:
+        app: The app to compile the pages for.
+        paths: The formatted routes of the pages.
+
+    Returns:
+        The custom components used by the pages.
+    """
+    custom_components = set()
+    for path in paths:
+        component = app.pages[path]
+        component.add_style(app.style)
+        compiler.compile_page(path, component, app.state)
+        custom_components |= component.get_custom_components()
+    return custom_components
+
+
+def compile_incremental(app: pc.App, page_modules: dict[str, str]):
+    """Compile only the pages whose fingerprint changed since the last compile.
+
+    This mirrors `pc.App.compile`, but keeps the compiled pages of unchanged
+    routes instead of purging the pages directory. If a changed page needs
+    custom components that were not compiled before, or whose definition
+    changed, every page is compiled so the shared components file is complete.
+    Pages without a known module are always compiled.
+
+    Only compiling is skipped: `add_page` has already built every page, since
+    pynecone builds the component of a page when it is added.
+
+    Args:
+        app: The app to compile, with every page added.
+        page_modules: The module defining each page, by formatted route.
+    """
+    # Update models during hot reload.
+    if pc.utils.get_config().db_url is not None:
+        pc.Model.create_all()
+
+    manifest = Manifest.load()
+    app_hash = state_hash(app) + source_hash(APP_MODULE)
+    fingerprints = {
+        path: fingerprint(page_modules[path], app_hash)
+        for path in app.pages
+        if path in page_modules
+    }
+    modules = set(SHARED_MODULES)
+    for path in fingerprints:
+        modules |= dependencies(page_modules[path])
+    module_hashes = {module: source_hash(module) for module in sorted(modules)}
+    changed_modules = {
+        module
+        for module, digest in module_hashes.items()
+        if manifest.modules.get(module) != digest
+    }
+
+    # Remove the compiled pages of routes that no longer exist.
+    for path in set(manifest.pages) - set(app.pages):
+        pc.utils.rm(compiler_utils.get_page_path(path))
+
+    # The document root and theme are cheap, so always compile them.
+    app.compile_document_root()
+    compiler.compile_theme(app.style)
+
+    # Compile the pages whose inputs changed.
+    changed, unchanged = [], []
+    for path in app.pages:
+        if (
+            path in fingerprints
+            and manifest.pages.get(path) == fingerprints[path]
+            and os.path.exists(compiler_utils.get_page_path(path))
+        ):
+            unchanged.append(path)
+        else:
+            changed.append(path)
+    custom_components = _compile_pages(app, changed)
+
+    # The components file is shared, so compile every page if it is outdated.
+    tags = {component.tag for component in custom_components}
+    outdated = not os.path.exists(compiler_utils.get_components_path()) or any(
+        component.component_fn.__module__ in changed_modules
+        for component in custom_components
+    )
+    if outdated or not tags <= set(manifest.components):
+        custom_components |= _compile_pages(app, unchanged)
+        compiler.compile_components(custom_components)
+        manifest.components = sorted({component.tag for component in custom_components})
+        changed += unchanged
+
+    pc.utils.console.print(f"Compiled {len(changed)} of {len(app.pages)} pages.")
+    manifest.pages = fingerprints
+    manifest.modules = module_hashes
+    manifest.save()
@@ -0,0 +1,555 @@
+"""Optimize the media in the assets dir at build time.
+
+Animated GIFs are transcoded to looping MP4 and WebM videos, downscaled to
+the size they are rendered at. PNG and JPEG images are resized to a range of
+widths in AVIF and WebP, or only WebP if the local ffmpeg can't write AVIF.
+The variants are written to the optimized assets dir, in a directory named
+by the hash of the source, so their URLs change whenever the source does. A manifest in the build dir, which is not served,
+maps each source to its variants, which the components read to serve the
+smallest one, along with a tiny placeholder of each to show until it loads.
+Sources whose variants are up to date are skipped, and sources that fail to
+transcode are left out of the manifest, so they are served as they are.
+
+Every asset is also copied to a directory named by its hash, and pages link
+to that copy with `hashed_url`. Since the URLs under the optimized assets dir
+change whenever their content does, they are served as immutable, and repeat
+visitors never revalidate them.
+
+The stage only uses a local ffmpeg, and still fingerprints the assets without
+it. Run it with `python -m pcweb.media`.
+"""
+
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from pynecone.base import Base
+
+from pcweb import constants
+
+# The ffmpeg arguments for each video variant, by extension, with its type.
+VIDEO_FORMATS = {
+    "webm": (
+        "video/webm",
+        [
+            "-c:v",
+            "libvpx-vp9",
+            "-crf",
+            "40",
+            "-b:v",
+            "0",
+            "-row-mt",
+            "1",
+            "-cpu-used",
+            "4",
+        ],
+    ),
+    "mp4": (
+        "video/mp4",
+        [
+            "-c:v",
+            "libx264",
+            "-crf",
+            "28",
+            "-preset",
+            "slow",
+            "-pix_fmt",
+            "yuv420p",
+            "-movflags",
+            "+faststart",
+        ],
+    ),
+}
+
+
+# The extensions of the media to optimize.
+MEDIA_EXTENSIONS = (".gif", ".png", ".jpg", ".jpeg")
+
+# The image formats to generate, by extension, with their types and arguments.
+IMAGE_FORMATS = {
+    "avif": (
+        "image/avif",
+        ["-c:v", "libaom-av1", "-still-picture", "1", "-crf", "32", "-cpu-used", "6"],
+    ),
+    "webp": ("image/webp", ["-c:v", "libwebp", "-quality", "80"]),
+}
+
+# The ffmpeg muxer and encoder each image format needs. The avif muxer was only
+# added in ffmpeg 5.1, so older builds, like Debian bullseye's, skip AVIF.
+IMAGE_FORMAT_REQUIREMENTS = {
+    "avif": ("avif", "libaom-av1"),
+    "webp": ("webp", "libwebp"),
+}
+
+# The pixel formats with transparency, which ffmpeg can't encode to AVIF.
+ALPHA_PIXEL_FORMATS = ("rgba", "bgra", "argb", "abgr", "ya8", "ya16", "yuva", "pal8")
+
+
+class MediaSource(Base):
+    """An optimized variant of an asset."""
+
+    # The URL of the variant.
+    src: str
+
+    # The MIME type of the variant.
+    type: str
+
+    # The width of the variant, for images.
+    width: Optional[int] = None
+
+
+class MediaEntry(Base):
+    """The optimized variants of an asset."""
+
+    # The hash of the source, to tell when the variants are stale.
+    source_hash: str
+
+    # The URL of the copy of the source named by its hash.
+    url: Optional[str] = None
+
+    # The URL of the image to show before the variant loads.
+    poster: Optional[str] = None
+
+    # A tiny copy of the image, as a data URL, to show before anything loads.
+    placeholder: Optional[str] = None
+
+    # The variants, in order of preference.
+    sources: List[MediaSource] = []
+
+
+class MediaManifest(Base):
+    """The optimized variants of each asset, by the URL of the source."""
+
+    entries: Dict[str, MediaEntry] = {}
+
+    @classmethod
+    def load(cls, path: str = constants.MEDIA_MANIFEST_PATH) -> MediaManifest:
+        """Load the manifest, or an empty one if there is none.
+
+        Args:
+            path: The path to load the manifest from.
+
+        Returns:
+            The manifest.
+        """
+        if not os.path.isfile(path):
+            return cls()
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def save(self, path: str = constants.MEDIA_MANIFEST_PATH):
+        """Write the manifest.
+
+        Args:
+            path: The path to write the manifest to.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.dict(), f, indent=2, sort_keys=True)
+
+
+def asset_path(url: str) -> str:
+    """Get the path of an asset from its URL.
+
+    Args:
+        url: The URL of the asset.
+
+    Returns:
+        The path of the asset, in the assets dir.
+    """
+    return os.path.join(constants.ASSETS_DIR, *url.lstrip("/").split("/"))
+
+
+def asset_url(path: str) -> str:
+    """Get the URL an asset is served at.
+
+    Args:
+        path: The path of the asset, in the assets dir.
+
+    Returns:
+        The URL of the asset.
+    """
+    return "/" + os.path.relpath(path, constants.ASSETS_DIR).replace(os.sep, "/")
+
+
+def file_hash(path: str) -> str:
+    """Hash the contents of a file.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        The hex digest of the file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ffmpeg() -> str | None:
+    """Find the local ffmpeg.
+
+    Returns:
+        The path to ffmpeg, or None if it isn't installed.
+    """
+    return os.environ.get("PCWEB_FFMPEG") or shutil.which("ffmpeg")
+
+
+@functools.lru_cache(maxsize=None)
+def ffmpeg_components(kind: str) -> frozenset[str]:
+    """List the muxers or encoders the local ffmpeg was built with.
+
+    Args:
+        kind: The kind of components, muxers or encoders.
+
+    Returns:
+        The names of the components.
+    """
+    output = subprocess.run(
+        [ffmpeg(), "-hide_banner", f"-{kind}"], capture_output=True, text=True
+    ).stdout
+    return frozenset(
+        line.split()[1]
+        for line in output.splitlines()
+        if len(line.split()) > 1 and not line.strip().startswith("--")
+    )
+
+
+def image_formats() -> dict[str, tuple[str, list[str]]]:
+    """Get the image formats the local ffmpeg can write.
+
+    Returns:
+        The formats of IMAGE_FORMATS whose muxer and encoder are available.
+    """
+    return {
+        extension: image_format
+        for extension, image_format in IMAGE_FORMATS.items()
+        if IMAGE_FORMAT_REQUIREMENTS[extension][0] in ffmpeg_components("muxers")
+        and IMAGE_FORMAT_REQUIREMENTS[extension][1] in ffmpeg_components("encoders")
+    }
+
+
+def hashed_dir(kind: str, source_hash: str) -> str:
+    """Get the directory to write the outputs for a source to.
+
+    Args:
+        kind: The kind of outputs.
+        source_hash: The hash of the source.
+
+    Returns:
+        The directory, which is created if it doesn't exist.
+    """
+    directory = os.path.join(constants.OPTIMIZED_ASSETS_DIR, kind, source_hash[:12])
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def fingerprint(source: str, source_hash: str) -> str:
+    """Copy an asset to a directory named by its hash.
+
+    Args:
+        source: The path of the asset.
+        source_hash: The hash of the asset.
+
+    Returns:
+        The URL of the copy.
+    """
+    output = os.path.join(hashed_dir("files", source_hash), os.path.basename(source))
+    shutil.copyfile(source, output)
+    return asset_url(output)
+
+
+def transcode_gif(
+    source: str, source_hash: str, height: int = constants.GALLERY_VIDEO_HEIGHT
+) -> list[MediaSource]:
+    """Transcode an animated GIF to looping videos.
+
+    Args:
+        source: The path of the GIF.
+        source_hash: The hash of the GIF, to name the output dir with.
+        height: The height to downscale the videos to, if it is taller.
+
+    Returns:
+        The variants, in order of preference.
+    """
+    stem = os.path.splitext(os.path.basename(source))[0]
+    directory = hashed_dir("videos", source_hash)
+    sources = []
+    for extension, (mime, codec) in VIDEO_FORMATS.items():
+        output = os.path.join(directory, f"{stem}.{extension}")
+        subprocess.run(
+            [
+                ffmpeg(),
+                "-y",
+                "-loglevel",
+                "error",
+                "-i",
+                source,
+                # Keep the sides even, which the encoders need.
+                "-vf",
+                f"scale=-2:'2*trunc(min({height},ih)/2)'",
+                "-an",
+                *codec,
+                output,
+            ],
+            check=True,
+        )
+        sources.append(MediaSource(src=asset_url(output), type=mime))
+    return sources
+
+
+def probe(source: str) -> tuple[int, bool]:
+    """Get the width of an image and whether it has transparency.
+
+    Args:
+        source: The path of the image.
+
+    Returns:
+        The width of the image, and whether it has an alpha channel.
+    """
+    output = subprocess.run(
+        [ffmpeg(), "-hide_banner", "-i", source],
+        capture_output=True,
+        text=True,
+    ).stderr
+    match = re.search(r"Video: [^,]+, (\w+).*?, (\d+)x(\d+)", output)
+    if match is None:
+        raise ValueError(f"Could not read the size of {source}.")
+    alpha = any(pixel_format in match.group(1) for pixel_format in ALPHA_PIXEL_FORMATS)
+    return int(match.group(2)), alpha
+
+
+def transcode_image(source: str, source_hash: str) -> list[MediaSource]:
+    """Resize an image to each width it is larger than, in modern formats.
+
+    Args:
+        source: The path of the image.
+        source_hash: The hash of the image, to name the output dir with.
+
+    Returns:
+        The variants, in order of preference.
+    """
+    width, alpha = probe(source)
+    widths = [w for w in constants.IMAGE_WIDTHS if w < width] + [width]
+    stem = os.path.splitext(os.path.basename(source))[0]
+    directory = hashed_dir("images", source_hash)
+
+    sources = []
+    for extension, (mime, codec) in image_formats().items():
+        if alpha and extension == "avif":
+            continue
+        for w in widths:
+            output = os.path.join(directory, f"{stem}-{w}.{extension}")
+            subprocess.run(
+                [
+                    ffmpeg(),
+                    "-y",
+                    "-loglevel",
+                    "error",
+                    "-i",
+                    source,
+                    "-vf",
+                    f"scale={w}:-2",
+                    *codec,
+                    output,
+                ],
+                check=True,
+            )
+            sources.append(MediaSource(src=asset_url(output), type=mime, width=w))
+    return sources
+
+
+def placeholder(source: str) -> str:
+    """Encode a tiny copy of an image, which looks blurred when scaled up.
+
+    Args:
+        source: The path of the image, or the GIF to take the first frame of.
+
+    Returns:
+        The copy, as a WebP data URL.
+    """
+    output = subprocess.run(
+        [
+            ffmpeg(),
+            "-loglevel",
+            "error",
+            "-i",
+            source,
+            "-frames:v",
+            "1",
+            "-vf",
+            f"scale={constants.PLACEHOLDER_WIDTH}:-2",
+            "-c:v",
+            "libwebp",
+            "-quality",
+            "50",
+            "-f",
+            "webp",
+            "pipe:1",
+        ],
+        capture_output=True,
+        check=True,
+    ).stdout
+    return "data:image/webp;base64," + base64.b64encode(output).decode()
+
+
+def transcode(source: str, entry: MediaEntry) -> MediaEntry:
+    """Optimize an asset.
+
+    Args:
+        source: The path of the asset.
+        entry: The entry of the asset, with its hash.
+
+    Returns:
+        The entry, with the optimized variants of the asset.
+    """
+    entry.placeholder = placeholder(source)
+    if not source.lower().endswith(".gif"):
+        entry.sources = transcode_image(source, entry.source_hash)
+        return entry
+
+    # Use the still image next to the GIF as the poster, if there is one.
+    poster = os.path.splitext(source)[0] + ".png"
+    entry.poster = asset_url(poster) if os.path.isfile(poster) else None
+    entry.sources = transcode_gif(source, entry.source_hash)
+    return entry
+
+
+def try_transcode(source: str, entry: MediaEntry) -> MediaEntry | None:
+    """Optimize an asset, reporting rather than raising if ffmpeg fails.
+
+    Args:
+        source: The path of the asset.
+        entry: The entry of the asset, with its hash.
+
+    Returns:
+        The entry, with the optimized variants of the asset, or None if the
+        asset could not be optimized.
+    """
+    try:
+        return transcode(source, entry)
+    except (subprocess.CalledProcessError, ValueError) as e:
+        print(f"Could not optimize {source}, so it is served as is: {e}")
+        return None
+
+
+def optimize(directory: str = constants.ASSETS_DIR) -> MediaManifest:
+    """Fingerprint and optimize the assets in a directory.
+
+    The media is transcoded in parallel, one ffmpeg process per CPU.
+
+    Args:
+        directory: The directory to search for assets.
+
+    Returns:
+        The updated manifest.
+    """
+    current = MediaManifest.load()
+    if ffmpeg() is None:
+        print("ffmpeg is not installed, so the media will not be optimized.")
+    else:
+        for extension in IMAGE_FORMATS.keys() - image_formats().keys():
+            print(f"ffmpeg can't write {extension}, so images will skip it.")
+
+    entries = {}
+    stale = {}
+    for dirpath, dirnames, filenames in os.walk(directory):
+        # Skip the outputs of previous runs.
+        if os.path.abspath(dirpath) == os.path.abspath(constants.OPTIMIZED_ASSETS_DIR):
+            dirnames.clear()
+            continue
+        for filename in sorted(filenames):
+            source = os.path.join(dirpath, filename)
+            source_hash = file_hash(source)
+            entry = current.entries.get(asset_url(source))
+            if (
+                entry is None
+                or entry.source_hash != source_hash
+                or entry.url is None
+                or not os.path.isfile(asset_path(entry.url))
+            ):
+                entry = MediaEntry(
+                    source_hash=source_hash, url=fingerprint(source, source_hash)
+                )
+            entries[asset_url(source)] = entry
+
+            # Find the media whose variants are missing or stale.
+            if ffmpeg() is None or not filename.lower().endswith(MEDIA_EXTENSIONS):
+                continue
+            if not entry.sources or not all(
+                os.path.isfile(asset_path(v.src)) for v in entry.sources
+            ):
+                stale[source] = entry
+            elif entry.placeholder is None:
+                try:
+                    entry.placeholder = placeholder(source)
+                except subprocess.CalledProcessError as e:
+                    print(f"Could not encode a placeholder for {source}: {e}")
+
+    # Drop the entries of removed assets, and save the entries of the assets
+    # that were optimized even if one fails.
+    current.entries = entries
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = executor.map(try_transcode, stale, stale.values())
+            for source, entry in zip(stale, results):
+                if entry is None:
+                    del entries[asset_url(source)]
+                else:
+                    print(f"Optimized {asset_url(source)}.")
+    finally:
+        current.save()
+    return current
+
+
+@functools.lru_cache(maxsize=None)
+def manifest() -> MediaManifest:
+    """Get the manifest written by the last build.
+
+    Returns:
+        The manifest.
+    """
+    return MediaManifest.load()
+
+
+def variants(url: str) -> MediaEntry | None:
+    """Get the optimized variants of an asset.
+
+    Args:
+        url: The URL of the asset, with or without the leading slash.
+
+    Returns:
+        The variants, or None if the asset wasn't optimized.
+    """
+    return manifest().entries.get("/" + url.lstrip("/"))
+
+
+def hashed_url(url: str) -> str:
+    """Get the URL of the copy of an asset named by its hash.
+
+    Args:
+        url: The URL of the asset, with or without the leading slash.
+
+    Returns:
+        The hashed URL, or the URL itself if the asset wasn't fingerprinted.
+    """
+    entry = variants(url)
+    if entry is None or entry.url is None:
+        return url
+    return entry.url
+
+
+if __name__ == "__main__":
+    optimize(*sys.argv[1:])
@@ -1,11 +1,62 @@
 """Application middleware."""
 
+from typing import Any, Dict, List, Optional, Set, Tuple
+
 import pynecone as pc
 
+# The events that are sent when a page loads.
+HYDRATE = "hydrate"
+
+
+class Middleware(pc.Middleware):
+    """Middleware that only runs for the events it subscribes to."""
+
+    # The names of the events to run for, relative to the app state, or None
+    # to run for every event.
+    events: Optional[Set[str]] = None
+
+    def setup(self, app: pc.App):
+        """Prepare the middleware for an app, once when it is added to it.
+
+        Args:
+            app: The app the middleware was added to.
+        """
+
 
-class CloseSidebarMiddleware(pc.Middleware):
+class CloseSidebarMiddleware(Middleware):
     """Middleware to make sure the sidebar closes when the page changes."""
 
+    # Only run when a page loads.
+    events: Optional[Set[str]] = {HYDRATE}
+
+    # The vars to reset when a page loads, by the name of their substate.
+    resets: Dict[str, Dict[str, Any]] = {
+        "navbar_state": {"sidebar_open": False},
+        "index_state": {"show_c2a": True},
+    }
+
+    # The substates of the client state to reset, with their vars, resolved
+    # once when the middleware is added to the app.
+    targets: List[Tuple[str, Dict[str, Any]]] = []
+
+    def setup(self, app: pc.App):
+        """Resolve the substates to reset in the app state.
+
+        Args:
+            app: The app the middleware was added to.
+
+        Raises:
+            ValueError: If the app has no such substate or var.
+        """
+        targets = []
+        for name, values in self.resets.items():
+            substate = app.state.get_class_substate((name,))
+            unknown = set(values) - set(substate.vars)
+            if unknown:
+                raise ValueError(f"{name} has no vars {', '.join(sorted(unknown))}.")
+            targets.append((substate.get_name(), values))
+        self.targets = targets
+
     def preprocess(self, app, state, event):
         """Preprocess the event.
 
@@ -14,6 +65,8 @@ class CloseSidebarMiddleware(pc.Middleware):
             state: The client state.
             event: The event to preprocess.
         """
-        if event.name == pc.utils.get_hydrate_event(state):
-            state.get_substate(["navbar_state"]).sidebar_open = False
-            state.get_substate(["index_state"]).show_c2a = True
+        substates = state.substates
+        for name, values in self.targets:
+            substate = substates[name]
+            for var, value in values.items():
+                setattr(substate, var, value)
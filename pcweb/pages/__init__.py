@@ -1,4 +1,7 @@
-from pcweb.route import Route
-from .index import index
+from pcweb.route import register, registry
+from pcweb.templates.webpage import DEFAULT_TITLE
 
-routes = [r for r in locals().values() if isinstance(r, Route)]
+# Names must differ from the page modules, which replace them once imported.
+index_route = register("pcweb.pages.index", path="/", title=DEFAULT_TITLE)
+
+routes = list(registry)
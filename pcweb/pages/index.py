@@ -1,12 +1,14 @@
-import asyncio
-from datetime import datetime
-
 import pynecone as pc
-from sqlmodel import Field
 
 from pcweb import styles
 from pcweb.base_state import State
+from pcweb.components.media import animation, lazy_background
+from pcweb.media import hashed_url
+from pcweb.pages import index_route
+from pcweb.scheduler import scheduler
 from pcweb.templates import webpage
+from pcweb.validation import validator
+from pcweb.waitlist import waitlist
 
 
 from pcweb.templates.docpage import (
@@ -17,7 +19,7 @@ from pcweb.templates.docpage import (
 background_style = {
     "background_size": "cover",
     "background_repeat": "no-repeat",
-    "background_image": "bg.svg",
+    "background_image": hashed_url("bg.svg"),
 }
 
 link_style = {
@@ -37,11 +39,6 @@ class Confetti(pc.Component):
 confetti = Confetti.create
 
 
-class Waitlist(pc.Model, table=True):
-    email: str
-    date_created: datetime = Field(default_factory=datetime.utcnow, nullable=False)
-
-
 class IndexState(State):
     """Hold the state for the home page."""
 
@@ -51,6 +48,9 @@ class IndexState(State):
     # The waitlist email.
     email: str
 
+    # Why the email can't be signed up, if it can't.
+    email_error: str = ""
+
     # Whether the user signed up for the waitlist.
     signed_up: bool = False
 
@@ -61,18 +61,43 @@ class IndexState(State):
         """Close the call to action."""
         self.show_c2a = False
 
-    def signup(self):
+    def set_email(self, email: str):
+        """Set the waitlist email, if it is valid.
+
+        Args:
+            email: The email entered.
+        """
+        try:
+            self.email = validator.normalize(email)
+            self.email_error = ""
+        except ValueError:
+            self.email = ""
+            self.email_error = "Email không hợp lệ." if email.strip() else ""
+
+    async def signup(self):
         """Sign the user up for the waitlist."""
+        if not self.email:
+            return
+
+        # Check the domain accepts mail, off the event loop.
+        if not await validator.is_deliverable(self.email):
+            self.email_error = "Tên miền của email này không nhận thư."
+            return
+
+        # Queue the signup, so the handler doesn't wait for the database.
+        waitlist.add(self.email)
+        self.signed_up = True
         return self.start_confetti
 
     def start_confetti(self):
         """Start the confetti."""
         self.show_confetti = True
-        return self.stop_confetti
 
-    async def stop_confetti(self):
+        # Stop the confetti after a while, without holding the handler.
+        scheduler.schedule(self, IndexState.stop_confetti, delay=5000)
+
+    def stop_confetti(self):
         """Stop the confetti."""
-        await asyncio.sleep(5)
         self.show_confetti = False
 
 
@@ -156,6 +181,10 @@ def landing():
                     color=styles.ACCENT_COLOR,
                 ),
             ),
+            pc.cond(
+                IndexState.email_error,
+                pc.text(IndexState.email_error, color="red"),
+            ),
             spacing="2em",
         ),
         margin_y="5em",
@@ -179,7 +208,12 @@ def list_circle(text):
 def intro():
     return pc.box(
         container(
-            pc.image(src="icon.svg", width="4em", height="4em", margin_bottom="1em"),
+            pc.image(
+                src=hashed_url("icon.svg"),
+                width="4em",
+                height="4em",
+                margin_bottom="1em",
+            ),
             pc.flex(
                 pc.box(
                     pc.text(
@@ -235,7 +269,7 @@ def intro():
     )
 
 
-def card(*args, **kwargs):
+def card(*args, background=None, **kwargs):
     kwargs.update(
         {
             "padding": ["1em", "2em"],
@@ -246,115 +280,98 @@ def card(*args, **kwargs):
             "_hover": {"box_shadow": styles.DOC_SHADOW},
         }
     )
+    if background is not None:
+        # Load the background once the card is near the viewport.
+        src, display_width = background
+        return lazy_background(*args, src=src, display_width=display_width, **kwargs)
     return pc.vstack(*args, **kwargs)
 
 
-import plotly.graph_objects as go
-
-colors = [
-    "#756AEE",
-] * 4
-colors[2] = "#EE756A"
-
-fig = go.Figure(
-    data=[
-        go.Bar(
-            x=["A", "B", "C", "D"],
-            y=[20, 13, 23, 27],
-            marker_color=colors,  # marker color can be a single color value or an iterable
-        )
-    ]
-)
+def components_card():
+    return card(
+        pc.text(
+            "Học tập thông qua cuộc thi.",
+            font_size=styles.H3_FONT_SIZE,
+            font_weight=styles.BOLD_WEIGHT,
+        ),
+        pc.text(
+            "Thi đấu giúp học sinh tập trung vào bài học, làm cho bài học thêm sinh động, đồng"
+            "thời rèn luyện kĩ năng làm việc nhóm và giải quyết vấn đề.",
+            color="#676767",
+        ),
+        doclink("Xem lại những cuộc thi của chúng tôi ->", href=""),
+        background=("graphbg.png", 480),
+        background_repeat="no-repeat",
+        background_position="bottom",
+        min_height="35em",
+        height="100%",
+        width="100%",
+        margin_bottom="1em",
+    )
 
-components_card = card(
-    pc.text(
-        "Học tập thông qua cuộc thi.",
-        font_size=styles.H3_FONT_SIZE,
-        font_weight=styles.BOLD_WEIGHT,
-    ),
-    pc.text(
-        "Thi đấu giúp học sinh tập trung vào bài học, làm cho bài học thêm sinh động, đồng"
-        "thời rèn luyện kĩ năng làm việc nhóm và giải quyết vấn đề.",
-        color="#676767",
-    ),
-    doclink(
-        "Xem lại những cuộc thi của chúng tôi ->",
-        href=""
-    ),
-    background_image="graphbg.png",
-    background_repeat="no-repeat",
-    background_position="bottom",
-    min_height="35em",
-    height="100%",
-    width="100%",
-    margin_bottom="1em",
-)
 
-styling_card = card(
-    pc.text(
-        "Hệ thống AI hiện đại.",
-        font_size=styles.H3_FONT_SIZE,
-        font_weight=styles.BOLD_WEIGHT,
-    ),
-    pc.text(
-        "Cá nhân hóa trải nghiệm của từng học sinh sử dụng AI chatbot."
-        "Các khuyến khích của AI sẽ được kiểm tra cẩn thận để phù hợp nhất"
-        "với học sinh.",
-        color="#676767",
-        margin_bottom="1em",
-    ),
-    doclink(
-        "Xem cách áp dụng AI đặc biệt của chúng tôi ->",
-        href=""
-    ),
-    pc.center(
-        pc.box(
-            position="absolute",
-            top="calc(50% - 4.5em)",
-            left="calc(50% - 4.5em)",
-            width="9em",
-            height="9em",
-            border_radius="50%",
-            z_index="20"
+def styling_card():
+    return card(
+        pc.text(
+            "Hệ thống AI hiện đại.",
+            font_size=styles.H3_FONT_SIZE,
+            font_weight=styles.BOLD_WEIGHT,
+        ),
+        pc.text(
+            "Cá nhân hóa trải nghiệm của từng học sinh sử dụng AI chatbot."
+            "Các khuyến khích của AI sẽ được kiểm tra cẩn thận để phù hợp nhất"
+            "với học sinh.",
+            color="#676767",
+            margin_bottom="1em",
         ),
-        doccode(
-            """edmaete.ai_prompt("Tìm ra khóa học tốt nhất để rèn luyện sự dũng cảm trước đám đông")
+        doclink("Xem cách áp dụng AI đặc biệt của chúng tôi ->", href=""),
+        pc.center(
+            pc.box(
+                position="absolute",
+                top="calc(50% - 4.5em)",
+                left="calc(50% - 4.5em)",
+                width="9em",
+                height="9em",
+                border_radius="50%",
+                z_index="20",
+            ),
+            doccode(
+                """edmaete.ai_prompt("Tìm ra khóa học tốt nhất để rèn luyện sự dũng cảm trước đám đông")
 { "name": "Bài 1: Không rụt rè trước đám đông",
    "duration": "120",
    "rating": 4.9
 }
 """,
-            theme="dark",
+                theme="dark",
+            ),
+            position="relative",
+            width="100%",
         ),
-        position="relative",
-        width="100%",
-    ),
-    height="100%",
-    margin_bottom="1em",
-)
+        height="100%",
+        margin_bottom="1em",
+    )
 
-react_card = card(
-    pc.text(
-        "Khi AI không hỗ trợ được bạn, hãy để chuyên gia lo.",
-        font_size=styles.H3_FONT_SIZE,
-        font_weight=styles.BOLD_WEIGHT,
-    ),
-    pc.text(
-        "Đội ngũ chuyên gia của chúng tôi sẽ giúp bạn về các vấn đề tâm sinh lý mà "
-        "AI không thể giúp đỡ được.",
-        color="#676767",
-    ),
-    doclink(
-        "Trò chuyện với chuyên gia ->",
-        href=""
-    ),
-    background_image="mentalhealth.jpg",
-    background_repeat="no-repeat",
-    background_position="center center",
-    background_size="10em",
-    height="100%",
-    margin_bottom="1em",
-)
+
+def react_card():
+    return card(
+        pc.text(
+            "Khi AI không hỗ trợ được bạn, hãy để chuyên gia lo.",
+            font_size=styles.H3_FONT_SIZE,
+            font_weight=styles.BOLD_WEIGHT,
+        ),
+        pc.text(
+            "Đội ngũ chuyên gia của chúng tôi sẽ giúp bạn về các vấn đề tâm sinh lý mà "
+            "AI không thể giúp đỡ được.",
+            color="#676767",
+        ),
+        doclink("Trò chuyện với chuyên gia ->", href=""),
+        background=("mentalhealth.jpg", 160),
+        background_repeat="no-repeat",
+        background_position="center center",
+        background_size="10em",
+        height="100%",
+        margin_bottom="1em",
+    )
 
 
 def intro_grid():
@@ -362,15 +379,15 @@ def intro_grid():
         container(
             pc.grid(
                 pc.grid_item(
-                    components_card,
+                    components_card(),
                     col_span=2,
                 ),
                 pc.grid_item(
-                    styling_card,
+                    styling_card(),
                     col_span=2,
                 ),
                 pc.grid_item(
-                    react_card,
+                    react_card(),
                     col_span=1,
                 ),
                 h="30em",
@@ -392,8 +409,8 @@ def intro_grid():
 def intro_gridmobile():
     return pc.box(
         container(
-            components_card,
-            styling_card,
+            components_card(),
+            styling_card(),
             width="100%",
             padding_y="1em",
         ),
@@ -403,8 +420,9 @@ def intro_gridmobile():
 def gallery_card(gif, website):
     return pc.link(
         pc.box(
-            pc.image(
-                src=gif,
+            animation(
+                gif,
+                lazy=True,
                 height="18em",
             ),
             border_radius="1em",
@@ -548,7 +566,7 @@ def c2a():
     return pc.box()
 
 
-@webpage(path="/")
+@webpage(path=index_route.path, title=index_route.title)
 def index() -> pc.Component:
     """Get the main Pynecone landing page."""
     return pc.box(
@@ -2,31 +2,87 @@
 
 import pynecone as pc
 
-from pcweb import styles
+from pcweb import client, constants, fonts, styles
+from pcweb.app import App, compiles
 from pcweb.base_state import State
 from pcweb.component_list import component_list
+from pcweb.incremental import page_module
+from pcweb.media import hashed_url
 from pcweb.middleware import CloseSidebarMiddleware
-from pcweb.pages import routes
+from pcweb.profiler import profiler
+from pcweb.route import Route, load_states
+from pcweb.scheduler import scheduler
+from pcweb.search import SearchIndex
+from pcweb.waitlist import migrate, waitlist
+from pcweb.snippets import format_cache, preformat
+
+# Format the doc snippets in parallel before the pages are built, in the
+# processes that compile them.
+if compiles():
+    preformat()
+
+from pcweb.pages import routes  # noqa: E402
+
+# Build the search index from the page sources, for the backend and the browser,
+# in the processes that compile the pages. The backend workers load it.
+if compiles():
+    search_index = SearchIndex.build(routes)
+    search_index.save()
+    search_index.save_asset()
+
+# Register the states defined by the pages before the app is created.
+load_states()
 
 # Create the app.
-app = pc.App(
+app = App(
     state=State,
     style=styles.BASE_STYLE,
-    stylesheets=styles.STYLESHEETS,
+    stylesheets=fonts.stylesheets(),
+    preloads=fonts.preloads(),
+    incremental=constants.INCREMENTAL_COMPILE,
 )
 
-# Add the pages to the app.
-for route in routes:
+
+def add_page(route: Route):
+    """Add a route to the app.
+
+    Args:
+        route: The route to add.
+    """
     app.add_page(
         route.component,
         route.path,
         route.title,
         description="Write web apps in pure Python. Deploy in minutes.",
-        image="preview.png",
+        image=hashed_url("preview.png"),
     )
+    app.page_modules[pc.utils.format_route(route.path)] = page_module(route)
+
 
-# Add the middleware.
+# Fire delayed events from the app's scheduler.
+scheduler.attach(app)
+
+# Write the waitlist signups in batches from the app.
+migrate()
+waitlist.attach(app)
+
+# Add the browser-side components to the frontend.
+client.write_modules()
+client.write_config()
+
+# Add the pages.
+for route in routes:
+    add_page(route)
+
+# Add the middleware, once building the pages defined the states it resets.
 app.add_middleware(CloseSidebarMiddleware(), index=0)
 
-# Run the app.
+# Compile the app.
 app.compile()
+
+# Report how many snippets were formatted from the cache, when profiling.
+if constants.PROFILE_STARTUP:
+    pc.utils.console.print(format_cache.stats())
+
+# Report the startup profile, if enabled.
+profiler.finish()
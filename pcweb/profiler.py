@@ -0,0 +1,184 @@
+"""Profile the startup of the app.
+
+When enabled, the time taken to import each module and to build each page is
+recorded. At the end of the startup a sorted report is printed and a JSON
+artifact is written to the build dir, so regressions can be tracked across
+releases.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import time
+from importlib.abc import Loader, MetaPathFinder
+
+from pcweb import constants
+
+
+class _TimingLoader(Loader):
+    """Wrap a loader to time the execution of the module."""
+
+    def __init__(self, loader: Loader, profiler: Profiler):
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.profiler._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            children = self.profiler._stack.pop()
+            if self.profiler._stack:
+                self.profiler._stack[-1] += total
+            self.profiler.imports[module.__name__] = {
+                "self": total - children,
+                "total": total,
+            }
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Find modules with the other finders and time loading them."""
+
+    def __init__(self, profiler: Profiler):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, self.profiler)
+            return spec
+        return None
+
+
+class Profiler:
+    """Record module import times and page construction times."""
+
+    def __init__(self):
+        """Initialize the profiler."""
+        # The self and total import time of each module, in seconds.
+        self.imports = {}
+
+        # The construction time of each page, in seconds.
+        self.pages = {}
+
+        self.enabled = False
+        self._stack = []
+        self._finder = _TimingFinder(self)
+        self._start = None
+
+    def start(self):
+        """Start recording."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._start = time.perf_counter()
+        sys.meta_path.insert(0, self._finder)
+
+    def stop(self):
+        """Stop recording."""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self.enabled = False
+
+    @contextlib.contextmanager
+    def page(self, kind: str, path: str):
+        """Time the construction of a page.
+
+        This can also decorate the function building the page.
+
+        Args:
+            kind: The template used for the page.
+            path: The path of the page.
+
+        Yields:
+            None
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.pages[path] = {
+                "template": kind,
+                "time": time.perf_counter() - start,
+            }
+
+    def to_dict(self) -> dict:
+        """Get the recorded timings.
+
+        Returns:
+            The timings, sorted slowest first.
+        """
+        imports = sorted(self.imports.items(), key=lambda i: -i[1]["self"])
+        pages = sorted(self.pages.items(), key=lambda p: -p[1]["time"])
+        return {
+            "startup": time.perf_counter() - self._start if self._start else 0.0,
+            "imports": [{"module": name, **times} for name, times in imports],
+            "pages": [{"path": path, **times} for path, times in pages],
+        }
+
+    def report(self, limit: int = 25) -> str:
+        """Format the slowest imports and pages as a table.
+
+        Args:
+            limit: The number of imports to show.
+
+        Returns:
+            The report.
+        """
+        data = self.to_dict()
+        lines = [f"Startup took {data['startup'] * 1000:.1f} ms.", ""]
+        lines.append(f"{'self ms':>10} {'total ms':>10}  module")
+        for entry in data["imports"][:limit]:
+            lines.append(
+                f"{entry['self'] * 1000:>10.1f} {entry['total'] * 1000:>10.1f}"
+                f"  {entry['module']}"
+            )
+        lines.append("")
+        lines.append(f"{'ms':>10} {'template':>10}  page")
+        for entry in data["pages"]:
+            lines.append(
+                f"{entry['time'] * 1000:>10.1f} {entry['template']:>10}"
+                f"  {entry['path']}"
+            )
+        return "\n".join(lines)
+
+    def write(self, path: str = constants.PROFILE_PATH):
+        """Write the timings as JSON.
+
+        Args:
+            path: The path to write the timings to.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def finish(self):
+        """Stop recording, print the report and write the JSON artifact."""
+        if not self.enabled:
+            return
+        self.stop()
+        print(self.report())
+        self.write()
+
+
+# The profiler for the app startup.
+profiler = Profiler()
@@ -1,5 +1,6 @@
 """Manage routing for the application."""
 
+import importlib
 import inspect
 from typing import Callable
 
@@ -19,6 +20,21 @@ class Route(Base):
     # The component to render for the route.
     component: pc.Component | Callable[[], pc.Component]
 
+    # The module defining the page contents.
+    module: str | None = None
+
+
+def module_path(name: str) -> str:
+    """Get the path for a page based on its module name.
+
+    Args:
+        name: The dotted name of the page module.
+
+    Returns:
+        The path of the page.
+    """
+    return name.replace(".", "/").replace("_", "-").split("pcweb/pages")[1]
+
 
 def get_path(component_fn: Callable):
     """Get the path for a page based on the file location.
@@ -29,4 +45,67 @@ def get_path(component_fn: Callable):
     module = inspect.getmodule(component_fn)
 
     # Create a path based on the module name.
-    return module.__name__.replace(".", "/").replace("_", "-").split("pcweb/pages")[1]
+    return module_path(module.__name__)
+
+
+# The registered page routes, in registration order.
+registry: list[Route] = []
+
+
+def register(
+    module: str,
+    title: str,
+    path: str | None = None,
+    name: str | None = None,
+) -> Route:
+    """Register a page without importing its module or building it.
+
+    The page module is only imported, and its component only built, when the
+    route's component is called. The page reads its path and title back
+    from the registered route, so they are only declared here.
+
+    Args:
+        module: The dotted name of the module defining the page.
+        title: The page title.
+        path: The path of the page. Defaults to the path of the module.
+        name: The name of the page route in the module. Defaults to the last
+            part of the module name.
+
+    Returns:
+        The registered route.
+    """
+    name = name or module.rpartition(".")[2]
+
+    def factory(*args, **kwargs) -> pc.Component:
+        """Import the page module and build the page.
+
+        Args:
+            *args: Args to pass to the page.
+            **kwargs: Kwargs to pass to the page.
+
+        Returns:
+            The page component.
+        """
+        page = getattr(importlib.import_module(module), name)
+        return page.component(*args, **kwargs)
+
+    route = Route(
+        path=path if path is not None else module_path(module),
+        title=title,
+        component=factory,
+        module=module,
+    )
+    registry.append(route)
+    return route
+
+
+def load_states():
+    """Import the registered page modules so the states they define exist.
+
+    The backend needs every state class to process events, even for pages it
+    never builds. Importing a module does not build its page. Only the app
+    calls this, so importing `pcweb.pages` alone imports no page module.
+    """
+    for route in registry:
+        if route.module is not None:
+            importlib.import_module(route.module)
@@ -0,0 +1,131 @@
+"""Fire events for clients after a delay."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+
+import pynecone as pc
+from pynecone.app import process
+from pynecone.event import Event, EventHandler
+
+
+class Scheduler:
+    """Fire delayed events from a single timer heap.
+
+    Event handlers that used to sleep before changing the state held a
+    coroutine per client for the whole delay. Instead, they schedule the
+    follow up event here and return immediately. One background task sleeps
+    until the earliest timer is due, processes the event against the client's
+    state and pushes the update over the websocket.
+    """
+
+    def __init__(self):
+        """Initialize the scheduler."""
+        # The app to process the events with.
+        self.app = None
+
+        # The pending timers, as (due, sequence, event, sid) tuples.
+        self._timers = []
+        self._sequence = itertools.count()
+        self._wakeup = None
+        self._task = None
+
+        # How many delayed events have been fired.
+        self.fired = 0
+
+    @property
+    def pending(self) -> int:
+        """The number of timers waiting to fire."""
+        return len(self._timers)
+
+    def attach(self, app: pc.App):
+        """Use the scheduler with an app.
+
+        This also exposes the scheduler metrics on the backend.
+
+        Args:
+            app: The app to process the delayed events with.
+        """
+        self.app = app
+        app.api.get("/metrics/scheduler")(self.metrics)
+
+    async def metrics(self) -> dict[str, int]:
+        """Get the scheduler metrics.
+
+        Returns:
+            The number of pending timers and fired events.
+        """
+        return {"pending": self.pending, "fired": self.fired}
+
+    def schedule(self, state: pc.State, handler: EventHandler, delay: int):
+        """Fire an event for the client of a state after a delay.
+
+        Args:
+            state: The state of the client to fire the event for.
+            handler: The event handler to fire.
+            delay: The delay in milliseconds.
+        """
+        event = Event(
+            token=state.get_token(),
+            name=pc.utils.format_event_handler(handler),
+            router_data=dict(state.router_data),
+        )
+        due = time.monotonic() + delay / 1000
+        heapq.heappush(
+            self._timers, (due, next(self._sequence), event, state.get_sid())
+        )
+
+        # Start the timer task, or wake it up if this timer is now the earliest.
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        elif self._timers[0][2] is event:
+            self._wakeup.set()
+
+    async def _run(self):
+        """Fire the timers as they become due."""
+        while self._timers:
+            timeout = self._timers[0][0] - time.monotonic()
+            if timeout > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, event, sid = heapq.heappop(self._timers)
+            try:
+                await self._fire(event, sid)
+            except Exception as e:
+                pc.utils.console.print(f"[red]Failed to fire {event.name}: {e}")
+
+    async def _fire(self, event: Event, sid: str):
+        """Process an event and send the update to the client.
+
+        Args:
+            event: The event to process.
+            sid: The Socket.IO session id of the client.
+        """
+        assert self.app is not None, "The scheduler is not attached to an app."
+        update = await process(
+            self.app,
+            event,
+            sid,
+            event.router_data.get(pc.constants.RouteVar.HEADERS, {}),
+            event.router_data.get(pc.constants.RouteVar.CLIENT_IP, ""),
+        )
+        self.fired += 1
+        await self.app.sio.emit(
+            str(pc.constants.SocketEvent.EVENT),
+            update.json(),
+            to=sid,
+            namespace=str(pc.constants.Endpoint.EVENT),
+        )
+
+
+# The scheduler for the app.
+scheduler = Scheduler()
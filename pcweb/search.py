@@ -0,0 +1,408 @@
+"""Search the pages of the site.
+
+The search index is built from the source of the page modules, without
+importing them. Each docheader and subheader starts a document, whose
+description is the doctext that follows it. Pages without headers are
+indexed by their title. The index is an inverted index scored with BM25,
+weighting matches in the heading over matches in the description.
+"""
+
+from __future__ import annotations
+
+import ast
+import bisect
+import functools
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import unicodedata
+from typing import Dict, List
+
+from pynecone.base import Base
+
+from pcweb import constants
+from pcweb.incremental import module_file
+from pcweb.route import Route, registry
+
+# The indexed fields of a document, and the weight of a match in each.
+FIELDS = ("heading", "description")
+FIELD_WEIGHTS = (2, 1)
+
+# The BM25 parameters.
+K1 = 1.2
+B = 0.75
+
+# The maximum length of the description shown in the results.
+DESCRIPTION_LENGTH = 160
+
+
+def fold(text: str) -> str:
+    """Lowercase text and strip its diacritics, so "hoc" matches "Học".
+
+    Args:
+        text: The text to fold.
+
+    Returns:
+        The folded text.
+    """
+    text = text.lower().replace("đ", "d")
+    return "".join(
+        c for c in unicodedata.normalize("NFD", text) if not unicodedata.combining(c)
+    )
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into search terms.
+
+    Args:
+        text: The text to split.
+
+    Returns:
+        The terms, in order.
+    """
+    return re.findall(r"\w+", fold(text))
+
+
+class Document(Base):
+    """A search result."""
+
+    # The heading of the section.
+    heading: str
+
+    # The text of the section.
+    description: str = ""
+
+    # The path of the page.
+    href: str
+
+
+class _SectionCollector(ast.NodeVisitor):
+    """Find the literal headers and text of a page, in order."""
+
+    def __init__(self, tree: ast.Module):
+        # The sections, as [heading, text] pairs.
+        self.sections = []
+
+        # Module level string constants, which pages often pass by name.
+        self.constants = {}
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1:
+                value = self.resolve(node.value)
+                if isinstance(node.targets[0], ast.Name) and value is not None:
+                    self.constants[node.targets[0].id] = value
+
+    def resolve(self, node: ast.expr | None) -> str | None:
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self.constants.get(node.id)
+        return None
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+        if name in ("docheader", "subheader"):
+            heading = self.resolve(node.args[0]) if node.args else None
+            if heading is not None:
+                self.sections.append([heading, []])
+        elif name == "doctext":
+            if not self.sections:
+                self.sections.append([None, []])
+            for arg in node.args:
+                for child in ast.walk(arg):
+                    text = self.resolve(child)
+                    if text is not None:
+                        self.sections[-1][1].append(text)
+            return
+        self.generic_visit(node)
+
+
+def page_documents(route: Route) -> list[Document]:
+    """Get the documents of a page.
+
+    Args:
+        route: The route of the page.
+
+    Returns:
+        The sections of the page, or a single document with its title.
+    """
+    title = (route.title or route.path).split(" | ")[0]
+    file = module_file(route.module) if route.module is not None else None
+    sections = []
+    if file is not None:
+        with open(file, encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        collector = _SectionCollector(tree)
+        collector.visit(tree)
+        sections = collector.sections
+    if not sections:
+        return [Document(heading=title, href=route.path)]
+    return [
+        Document(
+            heading=heading or title,
+            description=" ".join(" ".join(text).split()),
+            href=route.path,
+        )
+        for heading, text in sections
+    ]
+
+
+class SearchIndex(Base):
+    """An inverted index of the documents."""
+
+    # The documents, as [heading, description, href] lists.
+    documents: List[List[str]] = []
+
+    # The number of terms in each field of each document.
+    lengths: List[List[int]] = []
+
+    # The documents containing each term, as [document, frequency in each field].
+    postings: Dict[str, List[List[int]]] = {}
+
+    @classmethod
+    def build(cls, routes: list[Route]) -> SearchIndex:
+        """Build the index of a list of pages.
+
+        Args:
+            routes: The routes of the pages to index.
+
+        Returns:
+            The index.
+        """
+        index = cls()
+        for route in routes:
+            for document in page_documents(route):
+                number = len(index.documents)
+                fields = [tokenize(getattr(document, field)) for field in FIELDS]
+                index.lengths.append([len(terms) for terms in fields])
+                index.documents.append(
+                    [
+                        document.heading,
+                        document.description[:DESCRIPTION_LENGTH],
+                        document.href,
+                    ]
+                )
+                for term in sorted(set().union(*fields)):
+                    index.postings.setdefault(term, []).append(
+                        [number, *(terms.count(term) for terms in fields)]
+                    )
+        return index
+
+    @classmethod
+    def load(cls, path: str = constants.SEARCH_INDEX_PATH) -> SearchIndex:
+        """Load the index written by the build, or build it if there is none.
+
+        Args:
+            path: The path to load the index from.
+
+        Returns:
+            The index.
+        """
+        if not os.path.isfile(path):
+            return cls.build(registry)
+        with open(path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def save(self, path: str = constants.SEARCH_INDEX_PATH):
+        """Write the index.
+
+        Args:
+            path: The path to write the index to.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.dict(), f, ensure_ascii=False, separators=(",", ":"))
+
+    def compress(self) -> bytes:
+        """Compress the index, for the browser to search.
+
+        The keys are sorted and the gzip header has no timestamp, so the
+        output only depends on the contents of the index. Unchanged indexes
+        keep their URL and their cached copies in browsers.
+
+        Returns:
+            The gzipped JSON of the index.
+        """
+        data = json.dumps(
+            self.dict(), ensure_ascii=False, separators=(",", ":"), sort_keys=True
+        )
+        return gzip.compress(data.encode("utf-8"), compresslevel=9, mtime=0)
+
+    def asset_url(self) -> str:
+        """Get the URL the compressed index is served at.
+
+        Returns:
+            The URL, in a directory named by the hash of the compressed index.
+        """
+        digest = hashlib.sha256(self.compress()).hexdigest()
+        return f"/{constants.SEARCH_ASSET_DIR}/{digest[:12]}/{constants.SEARCH_ASSET}"
+
+    def save_asset(self) -> str:
+        """Write the compressed index to the assets dir.
+
+        The indexes written by earlier builds are removed, since the pages
+        compiled with this index only link to it.
+
+        Returns:
+            The URL the index is served at.
+        """
+        url = self.asset_url()
+        path = os.path.join(constants.ASSETS_DIR, *url.lstrip("/").split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.compress())
+
+        # Remove the directories of the previous indexes.
+        directory = os.path.dirname(os.path.dirname(path))
+        for name in os.listdir(directory):
+            previous = os.path.join(directory, name)
+            if previous != os.path.dirname(path) and os.path.isdir(previous):
+                shutil.rmtree(previous)
+        return url
+
+
+class SearchEngine:
+    """Answer queries from a search index."""
+
+    def __init__(self, index: SearchIndex):
+        """Initialize the engine.
+
+        Args:
+            index: The index to search.
+        """
+        self.index = index
+
+        # The sorted terms, to expand prefixes.
+        self.terms = sorted(index.postings)
+
+        # The average length of each field.
+        count = max(len(index.lengths), 1)
+        self.average_lengths = [
+            max(sum(lengths[i] for lengths in index.lengths) / count, 1)
+            for i in range(len(FIELDS))
+        ]
+
+        # The inverse document frequency of each term.
+        self.idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in index.postings.items()
+        }
+
+    def expand(self, prefix: str) -> list[str]:
+        """Get the terms starting with a prefix.
+
+        Args:
+            prefix: The prefix.
+
+        Returns:
+            The matching terms.
+        """
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + "\uffff", start)
+        return self.terms[start:end]
+
+    def score(self, term: str) -> dict[int, float]:
+        """Score the documents containing a term.
+
+        Args:
+            term: The term.
+
+        Returns:
+            The BM25 score of each document containing the term.
+        """
+        scores = {}
+        for number, *frequencies in self.index.postings.get(term, []):
+            lengths = self.index.lengths[number]
+            score = 0.0
+            for i, frequency in enumerate(frequencies):
+                if frequency == 0:
+                    continue
+                norm = 1 - B + B * lengths[i] / self.average_lengths[i]
+                score += (
+                    FIELD_WEIGHTS[i] * frequency * (K1 + 1) / (frequency + K1 * norm)
+                )
+            scores[number] = self.idf[term] * score
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> list[Document]:
+        """Find the documents matching every term of a query.
+
+        The last term also matches as a prefix, since it is usually still
+        being typed.
+
+        Args:
+            query: The query.
+            limit: The maximum number of documents to return.
+
+        Returns:
+            The best matching documents, best first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        totals = None
+        for i, term in enumerate(terms):
+            expanded = self.expand(term) if i == len(terms) - 1 else [term]
+            scores = {}
+            for match in expanded:
+                for number, score in self.score(match).items():
+                    scores[number] = scores.get(number, 0.0) + score
+            if totals is None:
+                totals = scores
+            else:
+                totals = {n: s + scores[n] for n, s in totals.items() if n in scores}
+            if not totals:
+                return []
+
+        best = sorted(totals, key=lambda n: (-totals[n], n))[:limit]
+        return [
+            Document(heading=heading, description=description, href=href)
+            for heading, description, href in (self.index.documents[n] for n in best)
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def engine() -> SearchEngine:
+    """Get the search engine for the site.
+
+    Returns:
+        The engine over the index written by the build.
+    """
+    return SearchEngine(SearchIndex.load())
+
+
+def index_url() -> str:
+    """Get the URL of the compressed index written by the build.
+
+    Returns:
+        The URL.
+    """
+    return engine().index.asset_url()
+
+
+@functools.lru_cache(maxsize=constants.SEARCH_CACHE_SIZE)
+def _search(query: str) -> tuple[Document, ...]:
+    """Search a normalized query."""
+    return tuple(engine().search(query))
+
+
+def search(query: str) -> list[dict[str, dict[str, str]]]:
+    """Search the pages of the site.
+
+    Results are memoized per normalized query in a bounded LRU cache.
+
+    Args:
+        query: The search query.
+
+    Returns:
+        The matching documents, in the shape of Typesense search hits.
+    """
+    query = " ".join(fold(query).split())
+    if not query:
+        return []
+    return [{"document": document.dict()} for document in _search(query)]
@@ -0,0 +1,365 @@
+"""Formatting and caching for documentation code snippets."""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata, util
+
+from pcweb import constants
+
+# The line length to format snippets with.
+LINE_LENGTH = 60
+
+
+class FormatCache:
+    """A content-addressed on-disk cache of black-formatted snippets.
+
+    Entries are keyed by a hash of the dedented source, the line length and the
+    black version, so upgrading black or changing the line length never serves
+    stale output. When the cache grows past its size bound, the least recently
+    used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str = constants.BLACK_CACHE_DIR,
+        max_bytes: int = constants.BLACK_CACHE_MAX_BYTES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: The directory to store the cache entries in.
+            max_bytes: The maximum total size of the cache entries.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}
+        self._size = None
+        self._black_version = None
+
+    @property
+    def black_version(self) -> str:
+        """The installed black version, read without importing black."""
+        if self._black_version is None:
+            self._black_version = metadata.version("black")
+        return self._black_version
+
+    def key(self, code: str, line_length: int = LINE_LENGTH) -> str:
+        """Get the cache key for a snippet.
+
+        Args:
+            code: The dedented source of the snippet.
+            line_length: The line length to format with.
+
+        Returns:
+            The hex digest identifying the formatted snippet.
+        """
+        digest = hashlib.sha256()
+        for part in (self.black_version, str(line_length), code):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.py")
+
+    def get(self, key: str) -> str | None:
+        """Get a formatted snippet from the cache.
+
+        Args:
+            key: The cache key of the snippet.
+
+        Returns:
+            The formatted snippet, or None if it is not cached.
+        """
+        if key in self._memory:
+            return self._memory[key]
+
+        file = self._file(key)
+        try:
+            with open(file, encoding="utf-8") as f:
+                formatted = f.read()
+        except OSError:
+            return None
+
+        # Touch the entry so it counts as recently used.
+        try:
+            os.utime(file)
+        except OSError:
+            pass
+        self._memory[key] = formatted
+        return formatted
+
+    def put(self, key: str, formatted: str):
+        """Store a formatted snippet in the cache.
+
+        Args:
+            key: The cache key of the snippet.
+            formatted: The formatted snippet.
+        """
+        self._memory[key] = formatted
+        os.makedirs(self.path, exist_ok=True)
+        file = self._file(key)
+
+        # The size of the entry this replaces, if any.
+        try:
+            old_size = os.path.getsize(file)
+        except OSError:
+            old_size = 0
+
+        # Write atomically so concurrent builds never read a partial entry.
+        tmp = f"{file}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(formatted)
+        os.replace(tmp, file)
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += os.path.getsize(file) - old_size
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """Get the (mtime, size, path) of every cache entry."""
+        if not os.path.isdir(self.path):
+            return []
+        entries = []
+        for entry in os.scandir(self.path):
+            if not entry.name.endswith(".py"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits its bound."""
+        entries = sorted(self._entries())
+        size = sum(size for _, size, _ in entries)
+        for _, entry_size, file in entries:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(file)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    def format(self, code: str, line_length: int = LINE_LENGTH) -> str:
+        """Format a snippet with black, using the cache when possible.
+
+        Args:
+            code: The source of the snippet.
+            line_length: The line length to format with.
+
+        Returns:
+            The formatted snippet.
+        """
+        code = textwrap.dedent(code)
+        key = self.key(code, line_length)
+        formatted = self.get(key)
+        if formatted is not None:
+            self.hits += 1
+            return formatted
+
+        self.misses += 1
+        formatted = _format_with_black(code, line_length)
+        self.put(key, formatted)
+        return formatted
+
+    def stats(self) -> str:
+        """Get a summary of the cache hits and misses.
+
+        Returns:
+            The cache statistics.
+        """
+        return f"Black cache: {self.hits} hits, {self.misses} misses."
+
+
+def _format_with_black(code: str, line_length: int = LINE_LENGTH) -> str:
+    """Format dedented code with black.
+
+    Args:
+        code: The dedented source to format.
+        line_length: The line length to format with.
+
+    Returns:
+        The formatted source.
+    """
+    # Only import black when formatting, so warm builds skip it entirely.
+    import black
+
+    return black.format_str(code, mode=black.FileMode(line_length=line_length))
+
+
+def _try_format_with_black(code: str) -> str | None:
+    """Format code in a worker process, returning None if it is invalid."""
+    try:
+        return _format_with_black(code)
+    except Exception:
+        return None
+
+
+# The cache used by the doc templates.
+format_cache = FormatCache()
+
+
+def demo_source(code: str, state: str | None = None, context: bool = False) -> str:
+    """Get the source that a doc demo displays.
+
+    Args:
+        code: The code to render the component.
+        state: Code for any state needed for the component.
+        context: Whether to wrap the render code in a function.
+
+    Returns:
+        The source of the demo snippet.
+    """
+    # Wrap the render code in a function if needed.
+    if context and code.startswith("pc"):
+        code = f"""def index():
+        return {code}
+        """
+
+    # Add the state code
+    if state is not None:
+        code = state + code
+    return code
+
+
+class _SnippetCollector(ast.NodeVisitor):
+    """Find the literal snippet sources passed to doccode and docdemo."""
+
+    def __init__(self, tree: ast.Module):
+        self.sources = set()
+
+        # Module level string constants, which pages often pass by name.
+        self.constants = {}
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1:
+                value = self.resolve(node.value)
+                if isinstance(node.targets[0], ast.Name) and value is not None:
+                    self.constants[node.targets[0].id] = value
+
+    def resolve(self, node: ast.expr | None) -> str | None:
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self.constants.get(node.id)
+        return None
+
+    def visit_Call(self, node: ast.Call):
+        self.generic_visit(node)
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+        if name not in ("doccode", "docdemo"):
+            return
+
+        kwargs = {kw.arg: kw.value for kw in node.keywords if kw.arg is not None}
+        code = self.resolve(node.args[0] if node.args else kwargs.get("code"))
+        if code is None:
+            return
+
+        if name == "doccode":
+            language = kwargs.get("language", ast.Constant("python"))
+            if self.resolve(language) == "python":
+                self.sources.add(code)
+            return
+
+        state = kwargs.get("state")
+        context = kwargs.get("context")
+        self.sources.add(
+            demo_source(
+                code,
+                state=self.resolve(state) if state is not None else None,
+                context=isinstance(context, ast.Constant) and bool(context.value),
+            )
+        )
+
+
+def collect_snippets(package: str = "pcweb.pages") -> set[str]:
+    """Collect the Python snippets declared in a package without importing it.
+
+    Only snippets given as string literals or module level string constants
+    are found. Anything else is still formatted when its page is built.
+
+    Args:
+        package: The package to search for snippets.
+
+    Returns:
+        The sources of the snippets.
+    """
+    spec = util.find_spec(package)
+    sources = set()
+    for root in spec.submodule_search_locations or []:
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if not filename.endswith(".py"):
+                    continue
+                with open(os.path.join(dirpath, filename), encoding="utf-8") as f:
+                    tree = ast.parse(f.read())
+                collector = _SnippetCollector(tree)
+                collector.visit(tree)
+                sources |= collector.sources
+    return sources
+
+
+def preformat(sources: set[str] | None = None, max_workers: int | None = None):
+    """Format snippets in parallel so page construction only does cache lookups.
+
+    black is CPU bound and holds the GIL, so uncached snippets are formatted
+    in a process pool.
+
+    Args:
+        sources: The snippets to format. Defaults to every snippet in the pages.
+        max_workers: The number of worker processes. Defaults to the CPU count.
+    """
+    if sources is None:
+        sources = collect_snippets()
+
+    # Find the snippets that are not already cached.
+    pending = {}
+    for source in sources:
+        code = textwrap.dedent(source)
+        key = format_cache.key(code)
+        if format_cache.get(key) is None:
+            pending[key] = code
+    if not pending:
+        return
+
+    # Starting a pool is not worth it for a single snippet.
+    if len(pending) == 1 or max_workers == 1:
+        results = map(_try_format_with_black, pending.values())
+        for key, formatted in zip(pending, results):
+            if formatted is not None:
+                format_cache.put(key, formatted)
+        return
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    chunksize = max(1, len(pending) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            _try_format_with_black, pending.values(), chunksize=chunksize
+        )
+        for key, formatted in zip(pending, results):
+            if formatted is not None:
+                format_cache.put(key, formatted)
+
+
+def format_python(code: str) -> str:
+    """Format a Python snippet for display.
+
+    Args:
+        code: The source of the snippet.
+
+    Returns:
+        The formatted snippet.
+    """
+    return format_cache.format(code).strip()
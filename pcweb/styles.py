@@ -60,7 +60,7 @@ BASE_STYLE = {
     },
 }
 
-# Fonts to include.
+# Fonts to include, until the self-hosted fonts are built by `pcweb.fonts`.
 STYLESHEETS = [
     "https://fonts.googleapis.com/css2?family=Inter:wght@100;200;300;400;500;600;700;800;900&display=swap",
     "https://fonts.googleapis.com/css2?family=Silkscreen&display=swap",
@@ -1,45 +1,46 @@
 """Template for documentation pages."""
 
-import asyncio
 import textwrap
-import uuid
 from typing import Callable
 
-import black
 import pynecone as pc
-from pynecone import utils
+from pynecone.style import Style
 
-from pcweb import styles
-from pcweb.base_state import State
+from pcweb import client, styles
+from pcweb.profiler import profiler
 from pcweb.route import Route, get_path
+from pcweb.snippets import demo_source, format_python
 
 
-class CopyToClipboard(pc.Component):
-    """Component to copy text to clipboard."""
+class CopyButton(pc.Component):
+    """A copy icon that shows feedback in the browser after copying."""
 
-    library = "react-copy-to-clipboard"
+    library = client.library("copy_button")
 
-    tag = "CopyToClipboard"
+    tag = "CopyButton"
 
     # The text to copy when clicked.
     text: pc.Var[str]
 
-    @classmethod
-    def get_triggers(cls) -> set[str]:
-        return super().get_triggers() | {"on_copy"}
+    # How long to show the feedback for, in milliseconds.
+    timeout: pc.Var[int]
 
+    # The style of the icon.
+    icon_style: pc.Var[dict]
 
-# Convenience method to create the compoennt.
-copy_to_clipboard = CopyToClipboard.create
+    # The color of the feedback.
+    accent_color: pc.Var[str]
+
+
+# Convenience method to create the component.
+copy_button = CopyButton.create
 
 
 @pc.component
 def code_block(
     code: pc.Var[str],
     language: pc.Var[str],
-    copied: pc.Var[bool],
     copy_text: pc.Var[str],
-    on_copy: pc.EventChain,
 ):
     return pc.box(
         pc.box(
@@ -59,30 +60,12 @@ def code_block(
             border_radius=styles.DOC_BORDER_RADIUS,
             box_shadow=styles.DOC_SHADOW_LIGHT,
         ),
-        pc.cond(
-            copied,
-            pc.tooltip(
-                pc.icon(
-                    tag="CheckCircleIcon",
-                    style=icon_style,
-                    color=styles.ACCENT_COLOR,
-                ),
-                label="Copied!",
-                close_on_click=False,
-                padding="0.5em",
-                border_radius="0.5em",
-                background_color=styles.ACCENT_COLOR,
-                is_open=copied,
-            ),
-            pc.tablet_and_desktop(
-                copy_to_clipboard(
-                    pc.icon(
-                        tag="CopyIcon",
-                        style=icon_style,
-                    ),
-                    text=pc.Var.create(copy_text, is_string=True),
-                    on_copy=on_copy,
-                ),
+        pc.tablet_and_desktop(
+            copy_button(
+                text=copy_text,
+                timeout=2000,
+                icon_style=Style(icon_style),
+                accent_color=styles.ACCENT_COLOR,
             ),
         ),
         position="relative",
@@ -95,9 +78,7 @@ def code_block(
 def code_block_dark(
     code: pc.Var[str],
     language: pc.Var[str],
-    copied: pc.Var[bool],
     copy_text: pc.Var[str],
-    on_copy: pc.EventChain,
 ):
     return pc.box(
         pc.box(
@@ -116,30 +97,12 @@ def code_block_dark(
             border_radius=styles.DOC_BORDER_RADIUS,
             box_shadow=styles.DOC_SHADOW_LIGHT,
         ),
-        pc.cond(
-            copied,
-            pc.tooltip(
-                pc.icon(
-                    tag="CheckCircleIcon",
-                    style=icon_style,
-                    color=styles.ACCENT_COLOR,
-                ),
-                label="Copied!",
-                close_on_click=False,
-                padding="0.5em",
-                border_radius="0.5em",
-                background_color=styles.ACCENT_COLOR,
-                is_open=copied,
-            ),
-            pc.tablet_and_desktop(
-                copy_to_clipboard(
-                    pc.icon(
-                        tag="CopyIcon",
-                        style=icon_style,
-                    ),
-                    text=pc.Var.create(copy_text, is_string=True),
-                    on_copy=on_copy,
-                ),
+        pc.tablet_and_desktop(
+            copy_button(
+                text=copy_text,
+                timeout=2000,
+                icon_style=Style(icon_style),
+                accent_color=styles.ACCENT_COLOR,
             ),
         ),
         position="relative",
@@ -148,30 +111,6 @@ def code_block_dark(
     )
 
 
-class ClipboardState(State):
-    """State for the clipboard."""
-
-    # The copied text.
-    text: str = ""
-
-    def copy(self, text: str):
-        """Set the text to copy.
-
-        Args:
-            text: The text to copy.
-        """
-        self.text = text
-
-    async def reset_text(self):
-        """Reset the copied text."""
-        # Wait in order to show the toast.
-        await asyncio.sleep(2)
-
-        # Reset the text.
-        self.reset()
-        self.text = ""
-
-
 # Docpage styles.
 icon_style = {
     "right": "1em",
@@ -233,6 +172,7 @@ def docpage(set_path: str | None = None) -> pc.Component:
         # Set the page title.
         title = f"{contents.__name__.replace('_', ' ').title()} | Pynecone"
 
+        @profiler.page("docpage", path)
         def wrapper(*args, **kwargs) -> pc.Component:
             """The actual function wrapper.
 
@@ -252,9 +192,6 @@ def docpage(set_path: str | None = None) -> pc.Component:
             # Create the docpage sidebar.
             sidebar = sb(url=path)
 
-            # Set the sidebar path for the navbar sidebar.
-            nav_sidebar = sb(url=path)
-
             # Get the previous and next sidebar links.
             prev, next = get_prev_next(path)
             links = []
@@ -285,7 +222,7 @@ def docpage(set_path: str | None = None) -> pc.Component:
 
             # Return the templated page.
             return pc.box(
-                navbar(sidebar=nav_sidebar),
+                navbar(url=path),
                 pc.box(
                     pc.flex(
                         pc.desktop_only(
@@ -327,6 +264,7 @@ def docpage(set_path: str | None = None) -> pc.Component:
             path=path,
             title=title,
             component=wrapper,
+            module=contents.__module__,
         )
 
     return docpage
@@ -508,9 +446,7 @@ def doccode(
     """
     # For Python snippets, lint the code with black.
     if language == "python":
-        code = black.format_str(
-            textwrap.dedent(code), mode=black.FileMode(line_length=60)
-        ).strip()
+        code = format_python(code)
 
         # Replace "State" with "pc.State".
         code = code.replace("(State)", "(pc.State)")
@@ -524,20 +460,12 @@ def doccode(
     # Remove prompt characters from the copy text.
     copy_text = code.replace("$ ", "")
 
-    # A unique id for the code snippet.
-    uid = str(uuid.uuid4())
-
     # Create the code snippet.
     cb = code_block if theme == "light" else code_block_dark
     return cb(
         code=code,
         language=language,
-        copied=ClipboardState.text == uid,
         copy_text=copy_text,
-        on_copy=lambda: [
-            ClipboardState.copy(pc.Var.create(utils.wrap(uid, '"'))),
-            ClipboardState.reset_text(),
-        ],
     )
 
 
@@ -579,20 +507,10 @@ def docdemo(
     if comp is None:
         comp = eval(code)
 
-    # Wrap the render code in a function if needed.
-    if context and code.startswith("pc"):
-        code = f"""def index():
-        return {code}
-        """
-
-    # Add the state code
-    if state is not None:
-        code = state + code
-
     # Create the demo.
     return pc.vstack(
         docdemobox(comp),
-        doccode(code),
+        doccode(demo_source(code, state=state, context=context)),
         width="100%",
         padding_bottom="1em",
         **props,
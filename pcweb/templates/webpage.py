@@ -2,6 +2,7 @@ from typing import Callable
 
 import pynecone as pc
 
+from pcweb.profiler import profiler
 from pcweb.route import Route
 
 DEFAULT_TITLE = "Edmæte: Học không lo lạc hướng."
@@ -32,6 +33,7 @@ def webpage(path: str, title: str = DEFAULT_TITLE, props=None) -> Callable:
             The templated route.
         """
 
+        @profiler.page("webpage", path)
         def wrapper(*children, **props) -> pc.Component:
             """The template component.
 
@@ -59,6 +61,7 @@ def webpage(path: str, title: str = DEFAULT_TITLE, props=None) -> Callable:
             path=path,
             title=title,
             component=wrapper,
+            module=contents.__module__,
         )
 
     return webpage
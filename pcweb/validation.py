@@ -0,0 +1,176 @@
+"""Validate waitlist emails without blocking the event loop.
+
+The syntax of an email is checked in the event handler, which is fast and
+needs no network. Whether its domain accepts mail is checked with DNS
+lookups in a thread pool. The result for each domain is cached for a while,
+and for much less if it doesn't accept mail, and concurrent checks of the
+same domain share one lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from email_validator import (
+    EmailNotValidError,
+    EmailUndeliverableError,
+    validate_email,
+    validate_email_deliverability,
+)
+
+from pcweb import constants
+
+# A resolver tells whether a domain accepts mail.
+Resolver = Callable[[str], bool]
+
+
+def dns_resolver(domain: str) -> bool:
+    """Check whether a domain accepts mail from its DNS records.
+
+    Lookups that time out count as deliverable, so a slow DNS server
+    doesn't turn signups away. Failing name servers count as undeliverable,
+    like missing domains, since email_validator doesn't tell them apart.
+
+    Args:
+        domain: The ASCII domain to check.
+
+    Returns:
+        Whether the domain has MX, A or AAAA records that accept mail.
+    """
+    try:
+        validate_email_deliverability(
+            domain, domain, timeout=constants.EMAIL_DNS_TIMEOUT
+        )
+    except EmailUndeliverableError:
+        return False
+    return True
+
+
+class StaticResolver:
+    """Resolve domains from a fixed list, for tests without a network."""
+
+    def __init__(self, domains: set[str]):
+        """Initialize the resolver.
+
+        Args:
+            domains: The domains that accept mail.
+        """
+        self.domains = {domain.lower() for domain in domains}
+
+    def __call__(self, domain: str) -> bool:
+        """Check whether a domain accepts mail.
+
+        Args:
+            domain: The domain to check.
+
+        Returns:
+            Whether the domain is in the list.
+        """
+        return domain.lower() in self.domains
+
+
+class EmailValidator:
+    """Validate the syntax and deliverability of emails."""
+
+    def __init__(
+        self,
+        resolver: Resolver = dns_resolver,
+        ttl: int = constants.EMAIL_DOMAIN_TTL,
+        negative_ttl: int = constants.EMAIL_DOMAIN_NEGATIVE_TTL,
+        max_workers: int = constants.EMAIL_VALIDATION_WORKERS,
+    ):
+        """Initialize the validator.
+
+        Args:
+            resolver: The resolver to check domains with.
+            ttl: How long to cache that a domain accepts mail, in seconds.
+            negative_ttl: How long to cache that a domain doesn't accept mail,
+                in seconds. DNS server failures are reported as undeliverable
+                domains, so they shouldn't turn signups away for long.
+            max_workers: The number of threads to look domains up in.
+        """
+        self.resolver = resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="email-validation"
+        )
+
+        # The cached results, as domain: (expiry, deliverable).
+        self._cache = {}
+
+        # The lookups in progress, by domain.
+        self._lookups = {}
+
+        # How many checks were answered from the cache, and how many looked up.
+        self.hits = 0
+        self.misses = 0
+
+    def normalize(self, email: str) -> str:
+        """Check the syntax of an email and normalize it.
+
+        Args:
+            email: The email to check.
+
+        Returns:
+            The normalized email.
+
+        Raises:
+            ValueError: If the email is not valid.
+        """
+        try:
+            result = validate_email(email.strip(), check_deliverability=False)
+        except EmailNotValidError as e:
+            raise ValueError(str(e)) from e
+        return result.email
+
+    async def is_deliverable(self, email: str) -> bool:
+        """Check whether the domain of a normalized email accepts mail.
+
+        Args:
+            email: The email to check.
+
+        Returns:
+            Whether the domain accepts mail.
+        """
+        domain = email.rpartition("@")[2].lower()
+        cached = self._cache.get(domain)
+        if cached is not None and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+
+        # Share the lookup with concurrent checks of the same domain.
+        lookup = self._lookups.get(domain)
+        if lookup is None:
+            self.misses += 1
+            lookup = asyncio.get_running_loop().run_in_executor(
+                self._executor, self.resolver, domain
+            )
+            self._lookups[domain] = lookup
+            try:
+                deliverable = await lookup
+            finally:
+                del self._lookups[domain]
+            self._store(domain, deliverable)
+            return deliverable
+        return await lookup
+
+    def _store(self, domain: str, deliverable: bool):
+        """Cache the result for a domain, evicting the oldest if full.
+
+        Args:
+            domain: The domain.
+            deliverable: Whether the domain accepts mail.
+        """
+        self._cache.pop(domain, None)
+        if len(self._cache) >= constants.EMAIL_DOMAIN_CACHE_SIZE:
+            del self._cache[next(iter(self._cache))]
+        ttl = self.ttl if deliverable else self.negative_ttl
+        self._cache[domain] = (time.monotonic() + ttl, deliverable)
+
+
+# The validator for waitlist signups.
+validator = EmailValidator()
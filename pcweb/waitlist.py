@@ -0,0 +1,317 @@
+"""Persist waitlist signups without blocking the event handlers.
+
+Run `python -m pcweb.waitlist` to migrate or export the waitlist.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from typing import IO
+
+import pynecone as pc
+import sqlalchemy
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Field
+
+from pcweb import constants, database
+
+# The dialects that can skip duplicate emails while inserting.
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+# The formats the waitlist can be exported in.
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+class Waitlist(pc.Model, table=True):
+    email: str = Field(index=True, sa_column_kwargs={"unique": True})
+    date_created: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class WaitlistWriter:
+    """Write waitlist signups in batches, behind the event handlers.
+
+    Inserting each signup in its own transaction serializes every worker on
+    the database write lock. Instead, signups are queued and returned from
+    immediately. One background task writes the queue in a single
+    transaction once it holds enough rows, or after a short interval, in a
+    thread so the event loop keeps serving clients.
+    """
+
+    def __init__(
+        self,
+        interval: int = constants.WAITLIST_FLUSH_MS,
+        batch_size: int = constants.WAITLIST_BATCH_SIZE,
+        engine: sqlalchemy.engine.Engine | None = None,
+        seen_size: int = constants.WAITLIST_SEEN_SIZE,
+    ):
+        """Initialize the writer.
+
+        Args:
+            interval: How long to wait for more signups, in milliseconds.
+            batch_size: How many signups to write at most per transaction.
+            engine: The engine to write with. Defaults to the shared engine.
+            seen_size: How many of the latest emails to remember.
+        """
+        self.interval = interval
+        self.batch_size = batch_size
+        self.engine = engine
+        self.seen_size = seen_size
+
+        # The signups waiting to be written, as (email, date) pairs.
+        self._queue = []
+
+        # The latest emails queued or written by this process, oldest first.
+        # Older repeats are skipped by the unique index when they are written.
+        self._seen = OrderedDict()
+
+        self._full = None
+        self._task = None
+
+        # How many signups and transactions have been written.
+        self.written = 0
+        self.batches = 0
+
+    @property
+    def pending(self) -> int:
+        """The number of signups waiting to be written."""
+        return len(self._queue)
+
+    def attach(self, app: pc.App):
+        """Write the pending signups when the app shuts down.
+
+        This also exposes the writer metrics on the backend.
+
+        Args:
+            app: The app to attach to.
+        """
+        app.api.on_event("shutdown")(self.flush)
+        app.api.get("/metrics/waitlist")(self.metrics)
+
+    async def metrics(self) -> dict[str, int]:
+        """Get the writer metrics.
+
+        Returns:
+            The number of pending and written signups, and of transactions.
+        """
+        return {
+            "pending": self.pending,
+            "written": self.written,
+            "batches": self.batches,
+        }
+
+    def add(self, email: str) -> bool:
+        """Queue a signup to be written.
+
+        Args:
+            email: The email to sign up.
+
+        Returns:
+            Whether the email was queued, rather than already signed up.
+        """
+        email = email.strip().lower()
+        if not email:
+            return False
+        if email in self._seen:
+            self._seen.move_to_end(email)
+            return False
+        self._seen[email] = None
+        if len(self._seen) > self.seen_size:
+            self._seen.popitem(last=False)
+        self._queue.append((email, datetime.utcnow()))
+
+        # Start the writer task, or wake it up if a batch is ready.
+        if self._task is None or self._task.done():
+            self._full = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        elif len(self._queue) >= self.batch_size:
+            self._full.set()
+        return True
+
+    async def _run(self):
+        """Write the queue in batches until it is empty."""
+        while self._queue:
+            if len(self._queue) < self.batch_size:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.interval / 1000)
+                except asyncio.TimeoutError:
+                    pass
+            await self.flush()
+
+    async def flush(self):
+        """Write the queued signups."""
+        while self._queue:
+            batch = self._queue[: self.batch_size]
+            del self._queue[: self.batch_size]
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._write, batch
+                )
+            except Exception as e:
+                pc.utils.console.print(f"[red]Failed to write the waitlist: {e}")
+
+                # Retry the batch with the next flush.
+                self._queue[:0] = batch
+                return
+
+    def _write(self, batch: list[tuple[str, datetime]]):
+        """Insert a batch of signups in one transaction.
+
+        Emails already on the waitlist, signed up by another worker or a
+        previous run, are skipped.
+
+        Args:
+            batch: The signups to insert.
+        """
+        engine = self.engine or database.get_engine()
+        rows = [{"email": email, "date_created": date} for email, date in batch]
+        table = Waitlist.__table__
+        insert = UPSERT_DIALECTS.get(engine.dialect.name)
+        with engine.begin() as connection:
+            if insert is not None:
+                statement = insert(table).on_conflict_do_nothing(
+                    index_elements=["email"]
+                )
+                written = connection.execute(statement.values(rows)).rowcount
+            else:
+                existing = set(
+                    connection.execute(
+                        sqlalchemy.select(table.c.email).where(
+                            table.c.email.in_([row["email"] for row in rows])
+                        )
+                    ).scalars()
+                )
+                rows = [row for row in rows if row["email"] not in existing]
+                if rows:
+                    connection.execute(table.insert(), rows)
+                written = len(rows)
+        self.written += written
+        self.batches += 1
+
+
+def migrate(engine: sqlalchemy.engine.Engine | None = None):
+    """Add the unique email index to an existing waitlist table.
+
+    Emails are normalized like signups are, trimmed and lowercased, and
+    duplicates are removed, keeping the earliest signup. New tables are
+    created with the index, and tables that have it are left alone, so the
+    app can migrate on every startup.
+
+    Args:
+        engine: The engine to migrate. Defaults to the shared engine.
+    """
+    engine = engine or database.get_engine()
+    inspector = sqlalchemy.inspect(engine)
+    if not inspector.has_table(Waitlist.__tablename__):
+        return
+    table = Waitlist.__table__
+    existing = {
+        index["name"]: bool(index["unique"])
+        for index in inspector.get_indexes(table.name)
+    }
+    if all(existing.get(index.name) for index in table.indexes):
+        return
+
+    email = sqlalchemy.func.lower(sqlalchemy.func.trim(table.c.email))
+    with engine.begin() as connection:
+        first = (
+            sqlalchemy.select(sqlalchemy.func.min(table.c.id))
+            .group_by(email)
+            .scalar_subquery()
+        )
+        connection.execute(table.delete().where(table.c.id.not_in(first)))
+        connection.execute(
+            table.update().where(table.c.email != email).values(email=email)
+        )
+        for index in table.indexes:
+            # Replace an index of the same name that doesn't enforce uniqueness.
+            if index.name in existing:
+                index.drop(connection)
+            index.create(connection)
+
+
+def export(
+    file: IO[str],
+    format: str = "csv",
+    chunk_size: int = constants.WAITLIST_EXPORT_CHUNK_SIZE,
+    engine: sqlalchemy.engine.Engine | None = None,
+) -> int:
+    """Write the waitlist to a file in constant memory.
+
+    The rows are streamed from a server-side cursor, in chunks.
+
+    Args:
+        file: The file to write to.
+        format: The format to write, csv or jsonl.
+        chunk_size: The number of rows to fetch at a time.
+        engine: The engine to read from. Defaults to the shared engine.
+
+    Returns:
+        The number of rows written.
+    """
+    engine = engine or database.get_engine()
+    table = Waitlist.__table__
+    columns = [table.c.email, table.c.date_created]
+    writer = csv.writer(file) if format == "csv" else None
+    if writer is not None:
+        writer.writerow([column.name for column in columns])
+
+    count = 0
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True).execute(
+            sqlalchemy.select(*columns).order_by(table.c.id)
+        )
+        for chunk in result.partitions(chunk_size):
+            for email, date_created in chunk:
+                if writer is not None:
+                    writer.writerow([email, date_created.isoformat()])
+                else:
+                    file.write(
+                        json.dumps(
+                            {"email": email, "date_created": date_created.isoformat()}
+                        )
+                        + "\n"
+                    )
+            count += len(chunk)
+    return count
+
+
+# The writer for the waitlist.
+waitlist = WaitlistWriter()
+
+
+def main():
+    """Migrate or export the waitlist from the command line."""
+    parser = argparse.ArgumentParser(description="Manage the waitlist.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="Add the unique email index.")
+    export_parser = commands.add_parser("export", help="Export the waitlist.")
+    export_parser.add_argument("path", help="The file to write, or - for stdout.")
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS)
+    export_parser.add_argument(
+        "--chunk-size", type=int, default=constants.WAITLIST_EXPORT_CHUNK_SIZE
+    )
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        migrate()
+        return
+
+    # Infer the format from the file extension.
+    format = args.format or ("jsonl" if args.path.endswith(".jsonl") else "csv")
+    if args.path == "-":
+        count = export(sys.stdout, format, args.chunk_size)
+    else:
+        with open(args.path, "w", newline="", encoding="utf-8") as file:
+            count = export(file, format, args.chunk_size)
+    print(f"Exported {count} signups.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
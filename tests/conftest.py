@@ -0,0 +1,44 @@
+"""Shared fixtures for the tests.
+
+The database tests run against SQLite, and also against Postgres if
+`PCWEB_TEST_POSTGRES_URL` is set to the url of a database they may write to.
+"""
+
+import os
+
+import pytest
+import sqlalchemy
+
+from pcweb import database
+
+# The url of the Postgres database to test against, if any.
+POSTGRES_URL = os.environ.get("PCWEB_TEST_POSTGRES_URL")
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def engine(request, tmp_path) -> sqlalchemy.engine.Engine:
+    """Get an engine on an empty database.
+
+    Args:
+        request: The fixture request, with the dialect to test.
+        tmp_path: A temporary directory for the SQLite database.
+
+    Yields:
+        The engine.
+    """
+    if request.param == "sqlite":
+        url = f"sqlite:///{tmp_path / 'test.db'}"
+    elif POSTGRES_URL is None:
+        pytest.skip("PCWEB_TEST_POSTGRES_URL is not set")
+    else:
+        url = POSTGRES_URL
+
+    engine = database.create_engine(url)
+    metadata = sqlalchemy.MetaData()
+    metadata.reflect(engine)
+    metadata.drop_all(engine)
+    yield engine
+    metadata = sqlalchemy.MetaData()
+    metadata.reflect(engine)
+    metadata.drop_all(engine)
+    engine.dispose()
@@ -0,0 +1,121 @@
+import pynecone as pc
+
+from pcweb.base_state import State, depends_on, infer_dependencies
+
+
+def getattr_var(self) -> str:
+    return getattr(self, "name")
+
+
+def alias_var(self) -> str:
+    state = self
+    return state.name
+
+
+def escaping_var(self) -> str:
+    return str(self)
+
+
+def constant_var(self) -> str:
+    return "constant"
+
+
+def test_infer_dependencies():
+    def greeting(self) -> str:
+        return f"{self.greeting}, {self.name}" if self.show else ""
+
+    assert infer_dependencies(greeting) == {"greeting", "name", "show"}
+
+
+def test_infer_dependencies_untracked():
+    for fn in (getattr_var, alias_var, escaping_var, constant_var):
+        assert infer_dependencies(fn) is None, fn.__name__
+    assert infer_dependencies(len) is None
+
+
+class TrackedState(State):
+    """A state with computed vars of each kind."""
+
+    first: str = "Ada"
+    last: str = "Lovelace"
+    count: int = 0
+
+    @pc.var
+    def full_name(self) -> str:
+        return f"{self.first} {self.last}"
+
+    @pc.var
+    def initials(self) -> str:
+        return "".join(part[0] for part in self.full_name.split())
+
+    @pc.var
+    @depends_on("count")
+    def doubled(self) -> int:
+        return getattr(self, "count") * 2
+
+    @pc.var
+    def untracked(self) -> str:
+        return str(self)[:0]
+
+
+class TrackedChildState(TrackedState):
+    """A substate reading the vars of its parent."""
+
+    suffix: str = "!"
+
+    @pc.var
+    def shout(self) -> str:
+        return self.first.upper() + self.suffix
+
+    @pc.var
+    def own(self) -> str:
+        return self.suffix * 2
+
+
+def test_computed_var_deps():
+    assert TrackedState.get_computed_var_deps() == {
+        "full_name": {"first", "last"},
+        "initials": {"first", "last"},
+        "doubled": {"count"},
+        "untracked": None,
+    }
+
+
+def delta(state: pc.State) -> dict:
+    """Get the delta of a state, and clean it.
+
+    Args:
+        state: The state.
+
+    Returns:
+        The names of the vars in the delta, by state.
+    """
+    delta = state.get_delta()
+    state.clean()
+    return {name: set(vars) for name, vars in delta.items()}
+
+
+def test_delta_only_recomputes_affected_vars():
+    state = TrackedState()
+    name = state.get_full_name()
+
+    state.count = 1
+    assert delta(state) == {name: {"count", "doubled", "untracked"}}
+
+    state.last = "Byron"
+    assert delta(state) == {
+        name: {"last", "full_name", "initials", "untracked"},
+    }
+
+
+def test_delta_recomputes_vars_of_inherited_changes():
+    state = TrackedState()
+    child = state.substates["tracked_child_state"]
+
+    state.first = "Grace"
+    child.suffix = "?"
+    assert delta(state)[child.get_full_name()] == {"suffix", "shout", "own"}
+
+    state.first = "Ada"
+    child.mark_dirty()
+    assert delta(state)[child.get_full_name()] == {"shout"}
@@ -0,0 +1,102 @@
+import pytest
+
+from pcweb import incremental
+from pcweb.incremental import dependencies, fingerprint, imports
+
+# The modules of a small site, by file.
+SOURCES = {
+    "pcweb/__init__.py": "",
+    "pcweb/styles.py": "",
+    "pcweb/pages/__init__.py": "from pcweb.pages import home, about\n",
+    "pcweb/pages/home.py": "from pcweb.components import hero\nimport pcweb.styles\n",
+    "pcweb/pages/about.py": "from ..components.footer import footer\n",
+    "pcweb/components/__init__.py": "",
+    "pcweb/components/hero.py": "import os\n",
+    "pcweb/components/footer.py": "from . import hero\n",
+}
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Write the modules of the site, and fingerprint them instead of pcweb.
+
+    Args:
+        tmp_path: A temporary directory for the site.
+        monkeypatch: The fixture to point the package root at the site with.
+
+    Returns:
+        The directory of the site.
+    """
+    for file, source in SOURCES.items():
+        path = tmp_path / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    monkeypatch.setattr(incremental, "_package_root", lambda: str(tmp_path))
+    monkeypatch.setattr(incremental, "SHARED_MODULES", ["pcweb.styles"])
+    monkeypatch.setattr(incremental, "MODULE_INPUTS", {})
+    return tmp_path
+
+
+def test_imports(site):
+    assert imports("pcweb.pages.home") == {
+        "pcweb.components",
+        "pcweb.components.hero",
+        "pcweb.styles",
+    }
+    assert imports("pcweb.pages.about") == {
+        "pcweb.components.footer",
+    }
+    assert imports("pcweb.components.footer") == {
+        "pcweb.components",
+        "pcweb.components.hero",
+    }
+
+
+def test_dependencies_skip_sibling_pages(site):
+    assert dependencies("pcweb.pages.about") == {
+        "pcweb",
+        "pcweb.pages",
+        "pcweb.pages.about",
+        "pcweb.components",
+        "pcweb.components.footer",
+        "pcweb.components.hero",
+    }
+
+
+def test_fingerprint_follows_imports(site):
+    home, about = fingerprint("pcweb.pages.home"), fingerprint("pcweb.pages.about")
+
+    (site / "pcweb/pages/home.py").write_text("import pcweb.styles\n")
+    assert fingerprint("pcweb.pages.home") != home
+    assert fingerprint("pcweb.pages.about") == about
+
+    (site / "pcweb/components/hero.py").write_text("import sys\n")
+    assert fingerprint("pcweb.pages.about") != about
+
+
+def test_fingerprint_includes_shared_modules(site):
+    about = fingerprint("pcweb.pages.about")
+
+    (site / "pcweb/styles.py").write_text("color = 'red'\n")
+    assert fingerprint("pcweb.pages.about") != about
+
+
+def test_fingerprint_includes_app_hash(site):
+    assert fingerprint("pcweb.pages.about", "a") != fingerprint(
+        "pcweb.pages.about", "b"
+    )
+
+
+def test_fingerprint_includes_module_inputs(site, monkeypatch):
+    manifest = site / "manifest.json"
+    monkeypatch.setattr(
+        incremental, "MODULE_INPUTS", {"pcweb.components.hero": [str(manifest)]}
+    )
+    about = fingerprint("pcweb.pages.about")
+
+    manifest.write_text("{}")
+    written = fingerprint("pcweb.pages.about")
+    assert written != about
+
+    manifest.write_text('{"a": 1}')
+    assert fingerprint("pcweb.pages.about") != written
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pcweb import route
+from pcweb.route import module_path, register
+
+
+@pytest.fixture
+def page_module(tmp_path, monkeypatch) -> str:
+    """Write a page module, and register pages in an empty registry.
+
+    Args:
+        tmp_path: A temporary directory for the module.
+        monkeypatch: The fixture to add the directory to the path with.
+
+    Yields:
+        The name of the module.
+    """
+    (tmp_path / "lazy_page.py").write_text(
+        "class lazy_page:\n    component = staticmethod(lambda: 'built')\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(route, "registry", [])
+    yield "lazy_page"
+    sys.modules.pop("lazy_page", None)
+
+
+def test_module_path():
+    assert module_path("pcweb.pages.docs.getting_started") == "/docs/getting-started"
+
+
+def test_register_does_not_import(page_module):
+    registered = register(page_module, path="/lazy", title="Lazy")
+
+    assert route.registry == [registered]
+    assert (registered.path, registered.title) == ("/lazy", "Lazy")
+    assert page_module not in sys.modules
+
+    assert registered.component() == "built"
+    assert page_module in sys.modules
+
+
+def test_load_states_imports_pages(page_module):
+    register(page_module, path="/lazy", title="Lazy")
+    route.load_states()
+
+    assert page_module in sys.modules
+
+
+def test_importing_pages_imports_no_page():
+    code = (
+        "import sys, pcweb.pages\n"
+        "print(sorted(m for m in sys.modules if m.startswith('pcweb.pages.')))\n"
+        "print(pcweb.pages.routes[0].path, pcweb.pages.routes[0].module)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        text=True,
+    ).stdout
+
+    assert output.splitlines() == ["[]", "/ pcweb.pages.index"]
@@ -0,0 +1,79 @@
+import pytest
+
+from pcweb import search
+from pcweb.route import Route
+from pcweb.search import Document, SearchEngine, SearchIndex
+
+# The sections of each page, as (heading, description) pairs, by path.
+PAGES = {
+    "/docs/state": [
+        ("State", "The state holds the vars of the app."),
+        ("Computed Vars", "Computed vars are derived from other vars of the state."),
+    ],
+    "/docs/components": [("Components", "Components render the state.")],
+    "/hoc": [("Học Python", "Bài học đầu tiên.")],
+}
+
+
+@pytest.fixture
+def engine(monkeypatch) -> SearchEngine:
+    """Get an engine over the documents of the test pages.
+
+    Args:
+        monkeypatch: The fixture to replace the page documents with.
+
+    Returns:
+        The engine.
+    """
+    monkeypatch.setattr(
+        search,
+        "page_documents",
+        lambda route: [
+            Document(heading=heading, description=description, href=route.path)
+            for heading, description in PAGES[route.path]
+        ],
+    )
+    routes = [Route(path=path, component=lambda: None) for path in PAGES]
+    return SearchEngine(SearchIndex.build(routes))
+
+
+def headings(documents: list[Document]) -> list[str]:
+    return [document.heading for document in documents]
+
+
+def test_heading_matches_rank_first(engine):
+    results = headings(engine.search("state"))
+
+    assert results[0] == "State"
+    assert sorted(results[1:]) == ["Components", "Computed Vars"]
+
+
+def test_every_term_must_match(engine):
+    assert headings(engine.search("computed state")) == ["Computed Vars"]
+    assert engine.search("computed python") == []
+
+
+def test_last_term_matches_as_prefix(engine):
+    assert headings(engine.search("comp")) == ["Components", "Computed Vars"]
+    assert headings(engine.search("comp vars")) == []
+
+
+def test_diacritics_are_folded(engine):
+    assert headings(engine.search("hoc python")) == ["Học Python"]
+    assert headings(engine.search("BÀI")) == ["Học Python"]
+
+
+def test_empty_query(engine):
+    assert engine.search("  ?! ") == []
+
+
+def test_limit(engine):
+    assert len(engine.search("state", limit=2)) == 2
+
+
+def test_compress_is_deterministic(engine):
+    index = engine.index
+    rebuilt = SearchIndex(**index.dict())
+
+    assert rebuilt.compress() == index.compress()
+    assert rebuilt.asset_url() == index.asset_url()
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from pcweb.validation import EmailValidator, StaticResolver
+
+
+class CountingResolver(StaticResolver):
+    """A static resolver that counts its lookups."""
+
+    def __init__(self, domains: set[str]):
+        super().__init__(domains)
+        self.lookups = []
+
+    def __call__(self, domain: str) -> bool:
+        self.lookups.append(domain)
+        return super().__call__(domain)
+
+
+def test_normalize():
+    validator = EmailValidator(resolver=StaticResolver(set()))
+
+    assert validator.normalize("  a@X.com ") == "a@x.com"
+    with pytest.raises(ValueError):
+        validator.normalize("not an email")
+
+
+def test_deliverable_domains_are_cached():
+    resolver = CountingResolver({"x.com"})
+    validator = EmailValidator(resolver=resolver, ttl=60, negative_ttl=60)
+
+    async def check():
+        return [
+            await validator.is_deliverable(email)
+            for email in ["a@x.com", "b@X.com", "a@y.com", "b@y.com"]
+        ]
+
+    assert asyncio.run(check()) == [True, True, False, False]
+    assert resolver.lookups == ["x.com", "y.com"]
+    assert (validator.hits, validator.misses) == (2, 2)
+
+
+def test_undeliverable_domains_expire_sooner():
+    resolver = CountingResolver({"x.com"})
+    validator = EmailValidator(resolver=resolver, ttl=60, negative_ttl=0)
+
+    async def check():
+        for email in ["a@x.com", "a@y.com", "b@x.com", "b@y.com"]:
+            await validator.is_deliverable(email)
+
+    asyncio.run(check())
+    assert resolver.lookups == ["x.com", "y.com", "y.com"]
+
+
+def test_concurrent_checks_share_a_lookup():
+    resolver = CountingResolver({"x.com"})
+    validator = EmailValidator(resolver=resolver)
+
+    async def check():
+        return await asyncio.gather(
+            *(validator.is_deliverable(f"{user}@x.com") for user in "abc")
+        )
+
+    assert asyncio.run(check()) == [True, True, True]
+    assert resolver.lookups == ["x.com"]
+    assert validator.misses == 1
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime
+
+import sqlalchemy
+
+from pcweb.waitlist import Waitlist, WaitlistWriter, migrate
+
+
+def create_legacy_table(engine: sqlalchemy.engine.Engine):
+    """Create the waitlist table as it was before emails were unique.
+
+    Args:
+        engine: The engine to create the table with.
+    """
+    metadata = sqlalchemy.MetaData()
+    sqlalchemy.Table(
+        Waitlist.__tablename__,
+        metadata,
+        sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True),
+        sqlalchemy.Column("email", sqlalchemy.String, index=True),
+        sqlalchemy.Column("date_created", sqlalchemy.DateTime, nullable=False),
+    )
+    metadata.create_all(engine)
+
+
+def emails(engine: sqlalchemy.engine.Engine) -> list[str]:
+    """Get the emails on the waitlist, in signup order.
+
+    Args:
+        engine: The engine to read with.
+
+    Returns:
+        The emails.
+    """
+    table = Waitlist.__table__
+    with engine.connect() as connection:
+        return list(
+            connection.execute(
+                sqlalchemy.select(table.c.email).order_by(table.c.id)
+            ).scalars()
+        )
+
+
+def test_migrate_normalizes_and_deduplicates(engine):
+    create_legacy_table(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            Waitlist.__table__.insert(),
+            [
+                {"email": email, "date_created": datetime.utcnow()}
+                for email in [" A@x.com", "b@x.com", "a@x.com", "B@X.COM ", "c@x.com"]
+            ],
+        )
+
+    migrate(engine)
+
+    assert emails(engine) == ["a@x.com", "b@x.com", "c@x.com"]
+    indexes = sqlalchemy.inspect(engine).get_indexes(Waitlist.__tablename__)
+    assert [bool(index["unique"]) for index in indexes] == [True]
+
+
+def test_migrate_is_idempotent(engine):
+    Waitlist.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            Waitlist.__table__.insert(),
+            {"email": "a@x.com", "date_created": datetime.utcnow()},
+        )
+
+    migrate(engine)
+    migrate(engine)
+
+    assert emails(engine) == ["a@x.com"]
+
+
+def test_migrate_without_table(engine):
+    migrate(engine)
+
+    assert not sqlalchemy.inspect(engine).has_table(Waitlist.__tablename__)
+
+
+def test_writer_skips_repeated_emails(engine):
+    Waitlist.__table__.create(engine)
+    writer = WaitlistWriter(interval=10, batch_size=2, engine=engine)
+
+    async def signup():
+        queued = [
+            writer.add(email)
+            for email in ["a@x.com", " A@X.com", "b@x.com", "c@x.com", ""]
+        ]
+        await writer.flush()
+        return queued
+
+    assert asyncio.run(signup()) == [True, False, True, True, False]
+    assert emails(engine) == ["a@x.com", "b@x.com", "c@x.com"]
+    assert writer.written == 3
+    assert writer.pending == 0
+
+
+def test_writer_forgets_old_emails(engine):
+    Waitlist.__table__.create(engine)
+    writer = WaitlistWriter(engine=engine, seen_size=2)
+
+    async def signup():
+        queued = [writer.add(email) for email in ["a@x.com", "b@x.com", "c@x.com"]]
+        queued.append(writer.add("a@x.com"))
+        await writer.flush()
+        return queued
+
+    # The repeat is queued again, but the unique index skips it.
+    assert asyncio.run(signup()) == [True, True, True, True]
+    assert emails(engine) == ["a@x.com", "b@x.com", "c@x.com"]
+    assert writer.written == 3